@@ -8,55 +8,108 @@ Main entry point for the application
 
 import sys
 import os
+import glob
 import logging
+import importlib.util
+import importlib.machinery
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root))
 
-# Setup logging
+# Setup console logging; the log file is added once settings are known
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(project_root, 'app.log')),
-        logging.StreamHandler()
-    ]
+    level=logging.WARNING,
+    format=LOG_FORMAT,
+    handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger('video_encoder')
 
-# Import required modules with better error handling
-required_modules = {
-    'PyQt5.QtWidgets': ['QApplication', 'QMainWindow', 'QWidget'],
-    'PyQt5.QtCore': ['QTranslator', 'QLocale'],
-    'PyQt5.QtGui': ['QDragEnterEvent', 'QDropEvent'],
-    'ui.main_window': ['MainWindow'],
-    'config.settings': ['Settings']
-}
-
-missing_modules = []
-for module, classes in required_modules.items():
+
+def _prewarm_paths(paths):
+    """Ask the kernel to start reading hot startup files into the page cache
+    
+    Best-effort only: any file or platform that doesn't support readahead
+    hints is silently skipped.
+    
+    Args:
+        paths: Iterable of file paths to prefetch
+    """
+    fadvise = getattr(os, 'posix_fadvise', None)
+    if fadvise is None and sys.platform != 'darwin':
+        return
+    
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            if fadvise is not None:
+                fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                # macOS: F_RDADVISE takes a struct radvisory {off_t, int}
+                import fcntl
+                import struct
+                size = os.fstat(fd).st_size
+                fcntl.fcntl(fd, getattr(fcntl, 'F_RDADVISE', 44), struct.pack('qi', 0, min(size, 0x7fffffff)))
+        except Exception:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _get_startup_paths():
+    """Collect the files read on every launch before the window appears
+    
+    Returns:
+        List of existing file paths worth prefetching
+    """
+    from config.settings import SETTINGS_PATH
+    
+    paths = [str(SETTINGS_PATH)]
+    
+    # Compiled translations
+    paths.extend(glob.glob(os.path.join(project_root, 'config', 'languages', '*.qm')))
+    
+    # The PyQt5 modules and platform plugin every launch loads, located without
+    # importing the package (not the whole tree: most of it is never loaded)
+    plugin = {'win32': 'qwindows', 'darwin': 'qcocoa'}.get(sys.platform, 'qxcb')
     try:
-        if module == 'PyQt5.QtWidgets':
-            from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget
-        elif module == 'PyQt5.QtCore':
-            from PyQt5.QtCore import QTranslator, QLocale
-        elif module == 'PyQt5.QtGui':
-            from PyQt5.QtGui import QDragEnterEvent, QDropEvent
-        elif module == 'ui.main_window':
-            from ui.main_window import MainWindow
-        elif module == 'config.settings':
-            from config.settings import Settings
-    except ImportError as e:
-        logger.error(f"Failed to import from {module}: {e}")
-        missing_modules.append(f"{module} ({', '.join(classes)})")
+        spec = importlib.util.find_spec('PyQt5')
+        if spec is not None and spec.submodule_search_locations:
+            for location in spec.submodule_search_locations:
+                for module in ('QtCore', 'QtGui', 'QtWidgets'):
+                    paths.extend(os.path.join(location, module + suffix)
+                                 for suffix in importlib.machinery.EXTENSION_SUFFIXES)
+                paths.extend(glob.glob(os.path.join(location, 'Qt*', 'plugins', 'platforms', f"*{plugin}.*")))
+    except Exception as e:
+        logger.debug(f"Could not locate PyQt5 for prefetching: {e}")
+    
+    return paths
 
-if missing_modules:
-    error_msg = f"Failed to import required modules: {', '.join(missing_modules)}"
-    logger.critical(error_msg)
-    print(f"Error: {error_msg}\nPlease install required dependencies with: pip install -r requirements.txt")
-    sys.exit(1)
+
+def setup_file_logging(settings):
+    """Install the log file handler and level according to user settings
+    
+    Args:
+        settings: Loaded application settings
+    """
+    if not settings.get('enable_logging', True):
+        return
+    
+    root_logger = logging.getLogger()
+    try:
+        file_handler = logging.FileHandler(os.path.join(project_root, 'app.log'))
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root_logger.addHandler(file_handler)
+    except OSError as e:
+        logger.warning(f"Could not open log file: {e}")
+    
+    level = logging.getLevelName(str(settings.get('log_level', 'INFO')).upper())
+    root_logger.setLevel(level if isinstance(level, int) else logging.INFO)
 
 
 def setup_exception_handling():
@@ -70,6 +123,17 @@ def setup_exception_handling():
 
 def main():
     """Main application entry point"""
+    # Imported here so early-exit paths don't pay for loading Qt
+    try:
+        from PyQt5.QtWidgets import QApplication, QMessageBox
+        from PyQt5.QtCore import QTranslator, QLocale
+        from ui.main_window import MainWindow
+        from config.settings import Settings
+    except ImportError as e:
+        logger.critical(f"Missing module: {e.name}")
+        print(f"Error: missing {e.name}. Run: pip install -r requirements.txt")
+        return 1
+    
     try:
         # Initialize application
         app = QApplication(sys.argv)
@@ -94,14 +158,25 @@ def main():
             settings = Settings()
             settings.reset()
         
+        # Setup logging according to settings
+        setup_file_logging(settings)
+        
         # Setup translation
         try:
             translator = QTranslator()
-            locale = settings.get('language', QLocale.system().name())
+            
+            # Only probe the system locale when no language is stored, then remember
+            # it as a supported code ('pt_BR' -> 'pt'; anything unknown -> 'en')
+            if settings.is_set('language'):
+                locale = settings.get('language')
+            else:
+                system_locale = QLocale.system().name()
+                locale = next((code for code in (system_locale, system_locale.split('_')[0])
+                               if code in Settings.AVAILABLE_LANGUAGES), 'en')
+                settings.set('language', locale)
             translator_path = os.path.join(project_root, 'config', 'languages', f"{locale}.qm")
             
-            if os.path.exists(translator_path):
-                translator.load(translator_path)
+            if os.path.exists(translator_path) and translator.load(translator_path):
                 app.installTranslator(translator)
         except Exception as e:
             logger.warning(f"Failed to load translations: {e}")
@@ -125,12 +200,22 @@ def main():
 
 
 if __name__ == "__main__":
+    # Stream startup files into the page cache while the interpreter keeps working
+    _prewarm_paths(_get_startup_paths())
+    
     # Setup exception handling
     setup_exception_handling()
     
-    # Create necessary directories if they don't exist
-    for directory in ['config/languages', 'core', 'ui/widgets', 'utils']:
-        os.makedirs(os.path.join(project_root, directory), exist_ok=True)
+    # Create necessary directories on first run only
+    sentinel = project_root / '.initialized'
+    if not sentinel.exists():
+        for directory in ('config/languages', 'core', 'ui/widgets', 'utils'):
+            (project_root / directory).mkdir(parents=True, exist_ok=True)
+        try:
+            sentinel.touch()
+        except OSError as e:
+            # Read-only install: the directories exist, just check again next launch
+            logger.debug(f"Could not write {sentinel}: {e}")
     
     # Run the application
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON Utilities Module
+Reads and writes the application's JSON files, using orjson when available
+"""
+
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = None
+    import json
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode UTF-8 encoded JSON bytes
+    
+    Args:
+        data: Raw JSON document
+        
+    Returns:
+        Decoded JSON data
+    """
+    if _json is not None:
+        return _json.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Decode a JSON file in a single read
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Decoded JSON data
+    """
+    return loads_json(Path(path).read_bytes())
+
+
+def dump_json(path: Union[str, Path], data: Any) -> None:
+    """Encode data as indented JSON and write it in a single call
+    
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+    """
+    if _json is not None:
+        encoded = _json.dumps(data, option=_json.OPT_INDENT_2)
+    else:
+        # Same layout as orjson's output, so the file doesn't depend on what is installed
+        encoded = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    Path(path).write_bytes(encoded)
@@ -6,13 +6,20 @@ Language Manager Module
 Handles language file loading with preference for US English
 """
 
+import io
 import os
-import json
 import logging
+import zipfile
 from pathlib import Path
 
+from config.json_utils import load_json, loads_json, dump_json
+
 logger = logging.getLogger('video_encoder.config.language_manager')
 
+# Optional archive holding every language JSON, read in one go instead of file by file
+BUNDLE_NAME = 'languages.zip'
+
+
 class LanguageManager:
     """Manages language files with preference for US English"""
     
@@ -29,24 +36,92 @@ class LanguageManager:
         self.languages_dir = Path(languages_dir)
         self.language_data = {}
         self.loaded_language = None
+        self._get = None  # Lookup function (language_data.get or Qt translator), set once a language is loaded
+        self.uses_qt_translator = False  # True when strings come from an installed .qm translation
+        self._translator = None  # QTranslator installed by this manager, if any
+        self._available_languages = None  # Cached result of get_available_languages
+        self._bundle = None  # In-memory language bundle; False once known to be missing
+    
+    def _get_bundle(self):
+        """Get the language bundle, reading it into memory on first use
+        
+        Returns:
+            ZipFile over the bundle contents, or None if no bundle is shipped
+        """
+        if self._bundle is None:
+            try:
+                data = (self.languages_dir / BUNDLE_NAME).read_bytes()
+                self._bundle = zipfile.ZipFile(io.BytesIO(data))
+            except (OSError, zipfile.BadZipFile):
+                self._bundle = False
+        return self._bundle or None
+    
+    def _bundle_mtime(self):
+        """Get the bundle file's modification time in nanoseconds (-1 if it is gone)"""
+        try:
+            return (self.languages_dir / BUNDLE_NAME).stat().st_mtime_ns
+        except OSError:
+            return -1
     
     def get_available_languages(self):
         """Get list of available language files
         
+        A loose JSON file is listed by its path when there is no bundled copy
+        or it was changed after the bundle was built (load_language reads it
+        then). Otherwise the language is listed as "<bundle path>/<code>.json",
+        a member of the bundle archive rather than a file on disk.
+        
         Returns:
-            Dictionary of language codes and their file paths
+            Dictionary of language codes and their sources
         """
+        if self._available_languages is not None:
+            return self._available_languages
+        
         languages = {}
         
         try:
+            bundle = self._get_bundle()
+            bundle_mtime = -1
+            if bundle is not None:
+                bundle_path = self.languages_dir / BUNDLE_NAME
+                bundle_mtime = self._bundle_mtime()
+                for name in bundle.namelist():
+                    if name.endswith('.json'):
+                        languages[name[:-5]] = f"{bundle_path}/{name}"
             for file in self.languages_dir.glob('*.json'):
                 lang_code = file.stem
-                languages[lang_code] = str(file)
+                if lang_code not in languages or file.stat().st_mtime_ns > bundle_mtime:
+                    languages[lang_code] = str(file)
         except Exception as e:
             logger.error(f"Error scanning language files: {e}")
+            return languages
         
+        self._available_languages = languages
         return languages
     
+    def invalidate(self):
+        """Forget cached language file listings (call after adding language files)"""
+        self._available_languages = None
+        self._bundle = None
+    
+    def build_bundle(self):
+        """Pack all language JSON files into the bundle archive (build/install step)
+        
+        Returns:
+            True if the bundle was written, False on error
+        """
+        try:
+            bundle_path = self.languages_dir / BUNDLE_NAME
+            with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+                for file in sorted(self.languages_dir.glob('*.json')):
+                    bundle.write(file, file.name)
+            self.invalidate()
+            logger.info(f"Built language bundle: {bundle_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error building language bundle: {e}")
+            return False
+    
     def load_language(self, lang_code='en'):
         """Load language file with preference for US English
         
@@ -57,41 +132,112 @@ class LanguageManager:
             True if language was loaded successfully, False otherwise
         """
         try:
-            # Check if we have a US English file
-            us_file = self.languages_dir / 'us.json'
-            en_file = self.languages_dir / 'en.json'
+            # One directory read instead of a stat() per candidate file
+            with os.scandir(self.languages_dir) as it:
+                entries = {entry.name: entry for entry in it if entry.is_file()}
             
-            # Priority: 1. us.json, 2. en.json (converted to US), 3. Requested language
-            if us_file.exists():
-                # Use US English file if it exists
-                with open(us_file, 'r', encoding='utf-8') as f:
-                    self.language_data = json.load(f)
-                self.loaded_language = 'us'
-                logger.info(f"Loaded US English language file")
+            # Priority: 1. us.json, 2. en.json (converted to US), 3. Requested language.
+            # The JSON table is loaded even with a Qt translation, as its fallback.
+            candidates = (
+                ('us.json', 'us', "Loaded US English language file"),
+                ('en.json', 'us', "Loaded English language file (treating as US)"),
+                (f"{lang_code}.json", lang_code, f"Loaded {lang_code} language file")
+            )
+            bundle = self._get_bundle() if BUNDLE_NAME in entries else None
+            bundle_names = set(bundle.namelist()) if bundle is not None else ()
+            bundle_mtime = self._bundle_mtime() if bundle_names else None
+            loaded = False
+            for file_name, loaded_language, message in candidates:
+                # A loose file edited after build_bundle() wins over its bundled copy
+                if file_name in entries and (file_name not in bundle_names
+                                             or entries[file_name].stat().st_mtime_ns > bundle_mtime):
+                    self.language_data = load_json(entries[file_name].path)
+                elif file_name in bundle_names:
+                    self.language_data = loads_json(bundle.read(file_name))
+                else:
+                    continue
+                
+                self.loaded_language = loaded_language
+                logger.info(message)
+                loaded = True
+                break
+            
+            # Prefer a compiled Qt translation, but only once it is really installed
+            qm_name = f"{lang_code}.qm"
+            if qm_name in entries and self._install_qt_translator(entries[qm_name].path):
+                if not loaded:
+                    self.language_data = {}
+                self._get = self._translate_qt
+                self.uses_qt_translator = True
+                self.loaded_language = lang_code
+                logger.info(f"Using {lang_code} Qt translation")
                 return True
-            elif en_file.exists():
-                # Use English file if it exists (treat as US)
-                with open(en_file, 'r', encoding='utf-8') as f:
-                    self.language_data = json.load(f)
-                self.loaded_language = 'us'  # Treat as US
-                logger.info(f"Loaded English language file (treating as US)")
+            
+            self._remove_qt_translator()
+            self.uses_qt_translator = False
+            if loaded:
+                self._get = self.language_data.get
                 return True
-            else:
-                # Try to load requested language
-                lang_file = self.languages_dir / f"{lang_code}.json"
-                if lang_file.exists():
-                    with open(lang_file, 'r', encoding='utf-8') as f:
-                        self.language_data = json.load(f)
-                    self.loaded_language = lang_code
-                    logger.info(f"Loaded {lang_code} language file")
-                    return True
-                else:
-                    logger.warning(f"Language file for {lang_code} not found")
-                    return False
+            
+            logger.warning(f"Language file for {lang_code} not found")
+            return False
         except Exception as e:
             logger.error(f"Error loading language file: {e}")
             return False
     
+    def _install_qt_translator(self, path):
+        """Load a .qm file and install it on the running Qt application
+        
+        Args:
+            path: Path to the .qm file
+            
+        Returns:
+            True if the translation was loaded and installed, False otherwise
+        """
+        try:
+            from PyQt5.QtCore import QCoreApplication, QTranslator
+        except ImportError:
+            return False
+        app = QCoreApplication.instance()
+        if app is None:
+            return False
+        
+        translator = QTranslator()
+        if not translator.load(path):
+            logger.warning(f"Could not load Qt translation {path}")
+            return False
+        
+        self._remove_qt_translator()
+        app.installTranslator(translator)
+        self._translator = translator
+        return True
+    
+    def _remove_qt_translator(self):
+        """Uninstall the translator installed by this manager, if any"""
+        if self._translator is None:
+            return
+        from PyQt5.QtCore import QCoreApplication
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.removeTranslator(self._translator)
+        self._translator = None
+    
+    def _translate_qt(self, key, default):
+        """Look up a key through the installed Qt translator
+        
+        Keys the .qm file doesn't translate fall back to the JSON table.
+        
+        Args:
+            key: Translation key (used as the source text in the .qm file)
+            default: Text to return if the key has no translation
+            
+        Returns:
+            Translated text or default
+        """
+        from PyQt5.QtCore import QCoreApplication
+        text = QCoreApplication.translate('app', key)
+        return self.language_data.get(key, default) if text == key else text
+    
     def get_text(self, key, default=None):
         """Get translated text for a key
         
@@ -102,12 +248,16 @@ class LanguageManager:
         Returns:
             Translated text or default
         """
-        if not self.language_data:
+        if default is None:
+            default = key
+        
+        if self._get is None:
             # Load default language if none loaded
-            self.load_language()
+            if not self.load_language():
+                return default
         
         # Return text from loaded language
-        return self.language_data.get(key, default if default is not None else key)
+        return self._get(key, default)
     
     def create_us_from_en(self):
         """Create a US English file from English file if it doesn't exist
@@ -125,12 +275,9 @@ class LanguageManager:
             
             # If English file exists, copy it to US
             if en_file.exists():
-                with open(en_file, 'r', encoding='utf-8') as f:
-                    en_data = json.load(f)
-                
-                with open(us_file, 'w', encoding='utf-8') as f:
-                    json.dump(en_data, f, indent=4)
+                dump_json(us_file, load_json(en_file))
                 
+                self.invalidate()
                 logger.info("Created US English file from English file")
                 return True
             else:
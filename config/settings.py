@@ -7,313 +7,37 @@ Handles application configuration including themes, languages, and user preferen
 """
 
 import os
-import json
+import atexit
 import logging
+import weakref
+import functools
+from collections import OrderedDict
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Union
 
+from config.json_utils import load_json, dump_json
+
 logger = logging.getLogger('video_encoder.config.settings')
 
+# Platform-specific base paths, resolved once at import
+_HOME = Path.home()
+if os.name == 'nt':  # Windows
+    _SETTINGS_DIR = Path(os.environ.get('APPDATA') or _HOME) / 'VideoEncoder'
+else:  # macOS, Linux
+    _SETTINGS_DIR = _HOME / '.config' / 'video-encoder'
+_VIDEOS_DIR = _HOME / 'Videos'
 
-class Settings:
-    """Manages application settings and preferences"""
-    
-    # Default settings
-    DEFAULT_SETTINGS = {
-        # General settings
-        'language': 'en',  # Default language
-        'theme': 'system',  # Default theme (system, light, dark)
-        'output_directory': '',  # Default output directory (empty = user's videos folder)
-        'check_updates': True,  # Check for updates on startup
-        
-        # Encoding settings
-        'default_quality': 'medium',  # Default quality preset
-        'default_format': 'mp4',  # Default output format
-        'default_prefix_template': 'simple',  # Default prefix template
-        'default_input_mode': 'files',  # Default input mode (files or directory)
-        'recursive_scan': False,  # Scan subdirectories by default
-        
-        # UI settings
-        'show_tooltips': True,  # Show tooltips
-        'confirm_overwrite': True,  # Confirm before overwriting files
-        'remember_last_directory': True,  # Remember last used directory
-        
-        # Advanced settings
-        'ffmpeg_path': '',  # Custom FFmpeg path (empty = auto-detect)
-        'max_recent_files': 10,  # Maximum number of recent files to remember
-        'enable_logging': True,  # Enable logging
-        'log_level': 'INFO',  # Logging level
-        
-        # Shortcuts
-        'shortcuts': {
-            'open_file': 'Ctrl+O',
-            'save_file': 'Ctrl+S',
-            'start_conversion': 'Ctrl+R',
-            'stop_conversion': 'Ctrl+X',
-            'settings': 'Ctrl+P',
-            'exit': 'Alt+F4'
-        },
-        
-        # Recent files
-        'recent_files': []
-    }
-    
-    # Available themes
-    AVAILABLE_THEMES = ['system', 'light', 'dark', 'blue', 'green']
-    
-    # Available languages
-    AVAILABLE_LANGUAGES = {
-        'en': 'English',
-        'es': 'Español',
-        'fr': 'Français',
-        'de': 'Deutsch',
-        'it': 'Italiano',
-        'pt': 'Português',
-        'ru': 'Русский',
-        'zh': '中文',
-        'ja': '日本語',
-        'ko': '한국어'
-    }
-    
-    def __init__(self):
-        """Initialize settings"""
-        self.settings_dir = self._get_settings_dir()
-        self.settings_file = os.path.join(self.settings_dir, 'settings.json')
-        self.settings = self.DEFAULT_SETTINGS.copy()
-        self.load_settings()
-    
-    def _get_settings_dir(self) -> str:
-        """Get the settings directory, create if it doesn't exist"""
-        try:
-            # Use platform-specific app data directory
-            if os.name == 'nt':  # Windows
-                app_data = os.environ.get('APPDATA', '')
-                if not app_data:
-                    app_data = os.path.expanduser('~')
-                settings_dir = os.path.join(app_data, 'VideoEncoder')
-            else:  # macOS, Linux
-                settings_dir = os.path.expanduser('~/.config/video-encoder')
-            
-            # Create directory if it doesn't exist
-            os.makedirs(settings_dir, exist_ok=True)
-            return settings_dir
-        except Exception as e:
-            logger.error(f"Error creating settings directory: {e}")
-            # Fallback to current directory
-            return os.path.abspath('.')
-    
-    def load_settings(self) -> bool:
-        """Load settings from file
-        
-        Returns:
-            True if settings were loaded successfully, False otherwise
-        """
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
-                
-                # Update settings with loaded values
-                for key, value in loaded_settings.items():
-                    if key in self.settings:
-                        self.settings[key] = value
-                
-                # Removed the logging message here
-                return True
-            else:
-                # Removed the logging message here too
-                return False
-        except Exception as e:
-            logger.error(f"Error loading settings: {e}")
-            return False
-    
-    def save_settings(self) -> bool:
-        """Save settings to file
-        
-        Returns:
-            True if settings were saved successfully, False otherwise
-        """
-        try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
-            
-            logger.info("Settings saved successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving settings: {e}")
-            return False
-    
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get a setting value
-        
-        Args:
-            key: Setting key
-            default: Default value if key not found
-            
-        Returns:
-            Setting value or default
-        """
-        return self.settings.get(key, default)
-    
-    def set(self, key: str, value: Any) -> bool:
-        """Set a setting value
-        
-        Args:
-            key: Setting key
-            value: Setting value
-            
-        Returns:
-            True if setting was set successfully, False otherwise
-        """
-        try:
-            self.settings[key] = value
-            return True
-        except Exception as e:
-            logger.error(f"Error setting {key}: {e}")
-            return False
-    
-    def reset(self) -> bool:
-        """Reset settings to defaults
-        
-        Returns:
-            True if settings were reset successfully, False otherwise
-        """
-        try:
-            self.settings = self.DEFAULT_SETTINGS.copy()
-            return self.save_settings()
-        except Exception as e:
-            logger.error(f"Error resetting settings: {e}")
-            return False
-    
-    def add_recent_file(self, file_path: str) -> bool:
-        """Add a file to recent files list
-        
-        Args:
-            file_path: File path to add
-            
-        Returns:
-            True if file was added successfully, False otherwise
-        """
-        try:
-            recent_files = self.settings.get('recent_files', [])
-            
-            # Remove if already exists
-            if file_path in recent_files:
-                recent_files.remove(file_path)
-            
-            # Add to beginning of list
-            recent_files.insert(0, file_path)
-            
-            # Limit list size
-            max_recent = self.settings.get('max_recent_files', 10)
-            self.settings['recent_files'] = recent_files[:max_recent]
-            
-            return True
-        except Exception as e:
-            logger.error(f"Error adding recent file: {e}")
-            return False
-    
-    def get_recent_files(self) -> List[str]:
-        """Get list of recent files
-        
-        Returns:
-            List of recent file paths
-        """
-        return self.settings.get('recent_files', [])
-    
-    def clear_recent_files(self) -> bool:
-        """Clear recent files list
-        
-        Returns:
-            True if list was cleared successfully, False otherwise
-        """
-        try:
-            self.settings['recent_files'] = []
-            return True
-        except Exception as e:
-            logger.error(f"Error clearing recent files: {e}")
-            return False
-    
-    def get_shortcut(self, action: str) -> str:
-        """Get keyboard shortcut for an action
-        
-        Args:
-            action: Action name
-            
-        Returns:
-            Shortcut string or empty string if not found
-        """
-        shortcuts = self.settings.get('shortcuts', {})
-        return shortcuts.get(action, '')
-    
-    def set_shortcut(self, action: str, shortcut: str) -> bool:
-        """Set keyboard shortcut for an action
-        
-        Args:
-            action: Action name
-            shortcut: Shortcut string
-            
-        Returns:
-            True if shortcut was set successfully, False otherwise
-        """
-        try:
-            shortcuts = self.settings.get('shortcuts', {})
-            shortcuts[action] = shortcut
-            self.settings['shortcuts'] = shortcuts
-            return True
-        except Exception as e:
-            logger.error(f"Error setting shortcut: {e}")
-            return False
-    
-    def get_output_directory(self) -> str:
-        """Get output directory, with fallback to user's videos folder
-        
-        Returns:
-            Output directory path
-        """
-        output_dir = self.settings.get('output_directory', '')
-        
-        if not output_dir or not os.path.isdir(output_dir):
-            # Fallback to user's videos folder
-            if os.name == 'nt':  # Windows
-                output_dir = os.path.join(os.path.expanduser('~'), 'Videos')
-            else:  # macOS, Linux
-                output_dir = os.path.join(os.path.expanduser('~'), 'Videos')
-            
-            # Create if it doesn't exist
-            os.makedirs(output_dir, exist_ok=True)
-        
-        return output_dir
-    
-    def get_theme_stylesheet(self) -> str:
-        """Get CSS stylesheet for current theme
-        
-        Returns:
-            CSS stylesheet string
-        """
-        theme = self.settings.get('theme', 'system')
-        
-        # If system theme, detect from system
-        if theme == 'system':
-            # This is a simplified detection, would be more complex in real app
-            # For Windows, could use registry or win32api
-            # For macOS/Linux, could use system commands
-            # For now, default to light
-            theme = 'light'
-        
-        # Return appropriate stylesheet
-        if theme == 'dark':
-            return self._get_dark_theme()
-        elif theme == 'blue':
-            return self._get_blue_theme()
-        elif theme == 'green':
-            return self._get_green_theme()
-        else:  # light theme
-            return self._get_light_theme()
-    
-    def _get_light_theme(self) -> str:
-        """Get light theme stylesheet"""
-        return """
+# Settings file name, and its usual location (e.g. for prefetching at startup)
+SETTINGS_FILE_NAME = 'settings.json'
+SETTINGS_PATH = _SETTINGS_DIR / SETTINGS_FILE_NAME
+
+# Delay before changed settings are written to disk, so bursts of changes share one write
+SAVE_DEBOUNCE_MS = 500
+
+
+# Theme stylesheets
+_LIGHT_THEME = """
         QWidget {
             background-color: #f5f5f5;
             color: #212121;
@@ -372,10 +96,8 @@ class Settings:
             background-color: #e0e0e0;
         }
         """
-    
-    def _get_dark_theme(self) -> str:
-        """Get dark theme stylesheet"""
-        return """
+
+_DARK_THEME = """
         QWidget {
             background-color: #212121;
             color: #f5f5f5;
@@ -436,10 +158,8 @@ class Settings:
             background-color: #616161;
         }
         """
-    
-    def _get_blue_theme(self) -> str:
-        """Get blue theme stylesheet"""
-        return """
+
+_BLUE_THEME = """
         QWidget {
             background-color: #e3f2fd;
             color: #0d47a1;
@@ -500,10 +220,8 @@ class Settings:
             background-color: #bbdefb;
         }
         """
-    
-    def _get_green_theme(self) -> str:
-        """Get green theme stylesheet"""
-        return """
+
+_GREEN_THEME = """
         QWidget {
             background-color: #e8f5e9;
             color: #1b5e20;
@@ -563,4 +281,432 @@ class Settings:
         QMenu::item:selected {
             background-color: #c8e6c9;
         }
-        """
\ No newline at end of file
+        """
+
+_THEMES = {
+    'light': _LIGHT_THEME,
+    'dark': _DARK_THEME,
+    'blue': _BLUE_THEME,
+    'green': _GREEN_THEME
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_settings_dir() -> str:
+    """Get the settings directory, create if it doesn't exist
+    
+    The result is cached so repeated Settings() constructions don't hit the filesystem.
+    """
+    try:
+        settings_dir = str(_SETTINGS_DIR)
+        
+        # Create directory if it doesn't exist (a single stat on warm starts)
+        if not os.path.isdir(settings_dir):
+            os.makedirs(settings_dir, exist_ok=True)
+        return settings_dir
+    except Exception as e:
+        logger.error(f"Error creating settings directory: {e}")
+        # Fallback to current directory
+        return os.path.abspath('.')
+
+
+# Default settings (read-only; user changes are stored as overrides on each Settings instance)
+_DEFAULTS = MappingProxyType({
+    # General settings
+    'language': 'en',  # Default language
+    'theme': 'system',  # Default theme (system, light, dark)
+    'output_directory': '',  # Default output directory (empty = user's videos folder)
+    'check_updates': True,  # Check for updates on startup
+    
+    # Encoding settings
+    'default_quality': 'medium',  # Default quality preset
+    'default_format': 'mp4',  # Default output format
+    'default_prefix_template': 'simple',  # Default prefix template
+    'default_input_mode': 'files',  # Default input mode (files or directory)
+    'recursive_scan': False,  # Scan subdirectories by default
+    
+    # UI settings
+    'show_tooltips': True,  # Show tooltips
+    'confirm_overwrite': True,  # Confirm before overwriting files
+    'remember_last_directory': True,  # Remember last used directory
+    
+    # Advanced settings
+    'ffmpeg_path': '',  # Custom FFmpeg path (empty = auto-detect)
+    'max_recent_files': 10,  # Maximum number of recent files to remember
+    'enable_logging': True,  # Enable logging
+    'log_level': 'INFO',  # Logging level
+    
+    # Shortcuts
+    'shortcuts': MappingProxyType({
+        'open_file': 'Ctrl+O',
+        'save_file': 'Ctrl+S',
+        'start_conversion': 'Ctrl+R',
+        'stop_conversion': 'Ctrl+X',
+        'settings': 'Ctrl+P',
+        'exit': 'Alt+F4'
+    }),
+    
+    # Recent files
+    'recent_files': ()
+})
+
+# Available languages
+_AVAILABLE_LANGUAGES = MappingProxyType({
+    'en': 'English',
+    'es': 'Español',
+    'fr': 'Français',
+    'de': 'Deutsch',
+    'it': 'Italiano',
+    'pt': 'Português',
+    'ru': 'Русский',
+    'zh': '中文',
+    'ja': '日本語',
+    'ko': '한국어'
+})
+
+
+# Settings objects alive in this process, written out once at exit
+_live_settings = weakref.WeakSet()
+
+
+@atexit.register
+def _write_pending_at_exit() -> None:
+    """Write every Settings object's unsaved changes at interpreter exit
+    
+    Written synchronously: the Qt application and its timers may already be gone.
+    """
+    for settings in list(_live_settings):
+        if settings._dirty:
+            settings._write()
+
+
+class Settings:
+    """Manages application settings and preferences"""
+    
+    # Fixed instance layout: smaller objects and slot-based attribute access
+    __slots__ = ('settings_dir', 'settings_file', '_overrides', '_dirty', '_save_timer', '__weakref__')
+    
+    # Default settings
+    DEFAULT_SETTINGS = _DEFAULTS
+    
+    # Available themes
+    AVAILABLE_THEMES = ['system', 'light', 'dark', 'blue', 'green']
+    
+    # Available languages
+    AVAILABLE_LANGUAGES = _AVAILABLE_LANGUAGES
+    
+    def __init__(self):
+        """Initialize settings"""
+        self.settings_dir = _get_settings_dir()
+        self.settings_file = os.path.join(self.settings_dir, SETTINGS_FILE_NAME)
+        self._overrides = {}  # Only values that differ from (or replace) the defaults
+        self._dirty = False  # True when there are changes not yet written to disk
+        self._save_timer = None  # Debounce timer for deferred saves (created on first use)
+        self.load_settings()
+        
+        # Make sure pending changes are written even if no timer fires
+        _live_settings.add(self)
+    
+    def load_settings(self) -> bool:
+        """Load settings from file
+        
+        Returns:
+            True if settings were loaded successfully, False otherwise
+        """
+        try:
+            if os.path.exists(self.settings_file):
+                loaded_settings = load_json(self.settings_file)
+                
+                # Keep only known settings as overrides
+                for key, value in loaded_settings.items():
+                    if key in _DEFAULTS:
+                        self._overrides[key] = value
+                
+                # Recent files are kept as an ordered set in memory
+                if 'recent_files' in self._overrides:
+                    self._overrides['recent_files'] = OrderedDict.fromkeys(self._overrides['recent_files'])
+                
+                # Removed the logging message here
+                return True
+            else:
+                # Removed the logging message here too
+                return False
+        except Exception as e:
+            logger.error(f"Error loading settings: {e}")
+            return False
+    
+    def save_settings(self) -> bool:
+        """Save settings to file
+        
+        Only overridden values are written; defaults are filled in on load.
+        
+        Returns:
+            True if settings were saved successfully, False otherwise
+        """
+        if not self._write():
+            return False
+        if self._save_timer is not None:
+            self._save_timer.stop()
+        return True
+    
+    def _write(self) -> bool:
+        """Write the overrides to the settings file (no Qt objects involved)
+        
+        Returns:
+            True if settings were saved successfully, False otherwise
+        """
+        try:
+            data = self._overrides
+            if 'recent_files' in data:
+                data = dict(data, recent_files=list(data['recent_files']))
+            dump_json(self.settings_file, data)
+            
+            self._dirty = False
+            logger.info("Settings saved successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving settings: {e}")
+            return False
+    
+    def is_set(self, key: str) -> bool:
+        """Check whether a setting has a stored value rather than its default
+        
+        Args:
+            key: Setting key
+            
+        Returns:
+            True if the value was set (now or in the settings file)
+        """
+        return key in self._overrides
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a setting value
+        
+        Args:
+            key: Setting key
+            default: Default value if key not found
+            
+        Returns:
+            Setting value or default
+        """
+        return self._overrides.get(key, _DEFAULTS.get(key, default))
+    
+    def set(self, key: str, value: Any) -> bool:
+        """Set a setting value
+        
+        Args:
+            key: Setting key
+            value: Setting value
+            
+        Returns:
+            True (kept for callers that check the result)
+        """
+        self._overrides[key] = value
+        self._schedule_save()
+        return True
+    
+    def update(self, values: Dict[str, Any]) -> bool:
+        """Set several values at once
+        
+        Like set(), the write is debounced, so repeated updates share one save.
+        
+        Args:
+            values: Setting keys and values
+            
+        Returns:
+            True (kept for callers that check the result)
+        """
+        self._overrides.update(values)
+        self._schedule_save()
+        return True
+    
+    def _schedule_save(self) -> None:
+        """Mark settings dirty and (re)start the debounced save timer
+        
+        Rapid successive changes collapse into a single write once the timer
+        fires. Without a running Qt application the write is deferred to exit.
+        """
+        self._dirty = True
+        
+        if self._save_timer is None:
+            try:
+                from PyQt5.QtCore import QCoreApplication, QTimer
+            except ImportError:
+                return
+            if QCoreApplication.instance() is None:
+                return
+            
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+            self._save_timer.timeout.connect(self.flush)
+        
+        # Restarting resets the interval so bursts of changes are coalesced
+        self._save_timer.start()
+    
+    def flush(self) -> bool:
+        """Write settings to disk now if there are unsaved changes
+        
+        Returns:
+            False if a needed write failed, True otherwise
+        """
+        if self._dirty:
+            return self.save_settings()
+        return True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the current overrides, e.g. to restore after a cancelled edit
+        
+        Returns:
+            Dictionary of overridden settings
+        """
+        return self._overrides.copy()
+    
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Restore overrides previously returned by snapshot()
+        
+        The restored values are saved like any other change, so a reset that
+        was already written to disk is undone there too.
+        
+        Args:
+            snapshot: Dictionary of overridden settings
+        """
+        self._overrides = snapshot.copy()
+        self._schedule_save()
+    
+    def reset(self) -> bool:
+        """Reset settings to defaults
+        
+        Returns:
+            True if settings were reset successfully, False otherwise
+        """
+        self._overrides = {}
+        return self.save_settings()
+    
+    def _get_recent_files_map(self) -> 'OrderedDict[str, None]':
+        """Get the recent files as an ordered set (most recent first), creating it if needed"""
+        recent_files = self._overrides.get('recent_files')
+        if not isinstance(recent_files, OrderedDict):
+            recent_files = OrderedDict.fromkeys(recent_files or ())
+            self._overrides['recent_files'] = recent_files
+        return recent_files
+    
+    def add_recent_file(self, file_path: str) -> bool:
+        """Add a file to recent files list
+        
+        Args:
+            file_path: File path to add
+        
+        Returns:
+            True (kept for callers that check the result)
+        """
+        recent_files = self._get_recent_files_map()
+        
+        # Add or move to the beginning of the list
+        recent_files[file_path] = None
+        recent_files.move_to_end(file_path, last=False)
+        self._schedule_save()
+        
+        # Limit list size
+        max_recent = self.get('max_recent_files', 10)
+        while len(recent_files) > max_recent:
+            recent_files.popitem(last=True)
+        
+        return True
+    
+    def remove_recent_file(self, file_path: str) -> bool:
+        """Remove a file from recent files list
+        
+        Args:
+            file_path: File path to remove
+            
+        Returns:
+            True if file was in the list and removed, False otherwise
+        """
+        recent_files = self._get_recent_files_map()
+        if file_path in recent_files:
+            del recent_files[file_path]
+            self._schedule_save()
+            return True
+        return False
+    
+    def get_recent_files(self) -> List[str]:
+        """Get list of recent files
+        
+        Returns:
+            List of recent file paths
+        """
+        return list(self.get('recent_files', []))
+    
+    def clear_recent_files(self) -> bool:
+        """Clear recent files list
+        
+        Returns:
+            True (kept for callers that check the result)
+        """
+        self._overrides['recent_files'] = OrderedDict()
+        self._schedule_save()
+        return True
+    
+    def get_shortcut(self, action: str) -> str:
+        """Get keyboard shortcut for an action
+        
+        Args:
+            action: Action name
+            
+        Returns:
+            Shortcut string or empty string if not found
+        """
+        shortcuts = self.get('shortcuts', {})
+        return shortcuts.get(action, '')
+    
+    def set_shortcut(self, action: str, shortcut: str) -> bool:
+        """Set keyboard shortcut for an action
+        
+        Args:
+            action: Action name
+            shortcut: Shortcut string
+            
+        Returns:
+            True (kept for callers that check the result)
+        """
+        shortcuts = dict(self.get('shortcuts', {}))
+        shortcuts[action] = shortcut
+        self._overrides['shortcuts'] = shortcuts
+        self._schedule_save()
+        return True
+    
+    def get_output_directory(self) -> str:
+        """Get output directory, with fallback to user's videos folder
+        
+        Returns:
+            Output directory path
+        """
+        output_dir = self.get('output_directory', '')
+        
+        if not output_dir or not os.path.isdir(output_dir):
+            # Fallback to user's videos folder
+            output_dir = str(_VIDEOS_DIR)
+            
+            # Create if it doesn't exist
+            os.makedirs(output_dir, exist_ok=True)
+        
+        return output_dir
+    
+    def get_theme_stylesheet(self) -> str:
+        """Get CSS stylesheet for current theme
+        
+        Returns:
+            CSS stylesheet string
+        """
+        theme = self.get('theme', 'system')
+        
+        # If system theme, detect from system
+        if theme == 'system':
+            # This is a simplified detection, would be more complex in real app
+            # For Windows, could use registry or win32api
+            # For macOS/Linux, could use system commands
+            # For now, default to light
+            theme = 'light'
+        
+        return _THEMES.get(theme, _LIGHT_THEME)
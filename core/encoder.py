@@ -8,19 +8,42 @@ Handles video encoding, conversion, and compression operations
 
 import os
 import sys
+import queue
+import asyncio
+import shutil
 import logging
 import tempfile
+import threading
 import subprocess
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from .file_manager import get_file_manager
+from config.json_utils import loads_json
 
 try:
-    import ffmpeg
+    import psutil
 except ImportError:
-    logging.error("ffmpeg-python module not found. Please install it with: pip install ffmpeg-python")
+    psutil = None  # Optional: only used to count physical cores
 
 logger = logging.getLogger('video_encoder.core.encoder')
 
+# ffmpeg and ffprobe on PATH, resolved once and shared by all encoders
+_FFMPEG_PATH = shutil.which('ffmpeg')
+_FFPROBE_PATH = shutil.which('ffprobe')
+
+# Common installation paths checked when ffmpeg is not on PATH
+_COMMON_FFMPEG_PATHS = (
+    os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'ffmpeg', 'bin', 'ffmpeg.exe'),
+    os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'), 'ffmpeg', 'bin', 'ffmpeg.exe'),
+    os.path.join(os.path.expanduser('~'), 'ffmpeg', 'bin', 'ffmpeg.exe')
+)
+
+# Usable accelerated encoders per ffmpeg executable, detected once per process
+# (batch worker processes receive the parent's result instead of detecting again)
+_detected_encoders = {}
+_detect_lock = threading.Lock()
+
 
 class VideoEncoder:
     """Handles video encoding operations using ffmpeg"""
@@ -44,87 +67,572 @@ class VideoEncoder:
     }
     
     # Supported input formats
-    SUPPORTED_FORMATS = [
+    SUPPORTED_FORMATS = frozenset({
         '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm',
         '.m4v', '.mpg', '.mpeg', '.3gp', '.3g2', '.mxf', '.ts'
-    ]
+    })
+    
+    # Software video encoders per codec family
+    SOFTWARE_ENCODERS = {
+        'h264': 'libx264',
+        'webm': 'libvpx-vp9'
+    }
+    
+    # Output container -> (video codec family, audio codec); other containers
+    # fall back to ffmpeg's own codec choice
+    OUTPUT_CODECS = {
+        'mp4': ('h264', 'aac'),
+        'mkv': ('h264', 'aac'),
+        'mov': ('h264', 'aac'),
+        'webm': ('webm', 'libopus')
+    }
+    AUDIO_BITRATE = '128k'
+    
+    # ffprobe processes to run at once for prefetching and batch probing
+    PROBE_WORKERS = 8
+    
+    # Faster encoders to prefer when available, in order of preference. Each
+    # stays in its family's codec, so quality and target size encodes of one
+    # container always produce the same codec (webm is always VP9).
+    # (VAAPI is left out: it needs an explicit device and hwupload filter chain)
+    ACCELERATED_ENCODERS = {
+        'h264': ['h264_nvenc', 'h264_qsv', 'h264_amf'],
+        'webm': ['vp9_qsv']
+    }
+    
+    # x264-style preset names mapped to NVENC (p1-p7) presets
+    NVENC_PRESETS = {
+        'veryfast': 'p2', 'faster': 'p3', 'medium': 'p4', 'slow': 'p5', 'veryslow': 'p7'
+    }
+    # libvpx ignores -preset; its speed knob is -cpu-used (0 slowest - 5 fastest in good mode)
+    VP9_CPU_USED = {
+        'veryfast': 5, 'faster': 4, 'medium': 2, 'slow': 1, 'veryslow': 0
+    }
     
     def __init__(self):
         """Initialize the encoder and verify ffmpeg installation"""
         self.ffmpeg_path = self._find_ffmpeg()
         if not self.ffmpeg_path:
             logger.warning("FFmpeg not found in PATH. Some features may not work correctly.")
+        self.ffprobe_path = self._find_ffprobe()
+        
+        # Physical cores (SMT siblings add little for x264 and cause contention)
+        self.physical_cores = (psutil.cpu_count(logical=False) if psutil else None) or os.cpu_count() or 1
+        
+        # Probe results keyed by (path, mtime, size) so each file is probed once
+        self._probe_cache = {}
+        
+        # Shared probe workers, started on first use: (path, Future or None) items
+        self._probe_queue = None
+        self._probe_lock = threading.Lock()
+        
+        # Constant ffmpeg arguments keyed by (quality, output format)
+        self._argv_cache = {}
+        
+        # Output directories already created, so batches skip repeated makedirs
+        self._known_dirs = set()
+        
+        # Encoder choice per codec family, worked out on first use: detecting
+        # hardware encoders runs test encodes, which must not delay startup
+        self._preferred_vcodec = None
+    
+    @property
+    def hw_encoders(self) -> frozenset:
+        """Usable accelerated encoders, detected on first use and shared within the process"""
+        if not self.ffmpeg_path:
+            return frozenset()
+        encoders = _detected_encoders.get(self.ffmpeg_path)
+        if encoders is None:
+            with _detect_lock:
+                encoders = _detected_encoders.get(self.ffmpeg_path)
+                if encoders is None:
+                    encoders = frozenset(self._detect_accelerated_encoders())
+                    _detected_encoders[self.ffmpeg_path] = encoders
+        return encoders
+    
+    def set_hw_encoders(self, encoders) -> None:
+        """Use an already detected encoder set (e.g. the parent's, in a worker process)
+        
+        Args:
+            encoders: Usable accelerated encoder names, as returned by hw_encoders
+        """
+        if self.ffmpeg_path:
+            _detected_encoders.setdefault(self.ffmpeg_path, frozenset(encoders))
+    
+    @property
+    def preferred_vcodec(self) -> Dict[str, str]:
+        """Video encoder to use per codec family (accelerated when available)"""
+        if self._preferred_vcodec is None:
+            hw_encoders = self.hw_encoders
+            self._preferred_vcodec = {
+                family: next((name for name in candidates if name in hw_encoders),
+                             self.SOFTWARE_ENCODERS[family])
+                for family, candidates in self.ACCELERATED_ENCODERS.items()
+            }
+        return self._preferred_vcodec
     
     def _find_ffmpeg(self) -> Optional[str]:
-        """Find ffmpeg executable in system PATH"""
+        """Find ffmpeg executable in system PATH or common installation paths"""
+        return _FFMPEG_PATH or next((path for path in _COMMON_FFMPEG_PATHS if os.path.isfile(path)), None)
+    
+    def _find_ffprobe(self) -> Optional[str]:
+        """Find ffprobe on PATH or next to the ffmpeg executable"""
+        if _FFPROBE_PATH:
+            return _FFPROBE_PATH
+        if self.ffmpeg_path:
+            directory, name = os.path.split(self.ffmpeg_path)
+            path = os.path.join(directory, name.replace('ffmpeg', 'ffprobe'))
+            if os.path.isfile(path):
+                return path
+        return None
+    
+    def _detect_accelerated_encoders(self) -> set:
+        """Find which accelerated encoders this ffmpeg build can actually use
+        
+        Hardware encoders are often compiled in without matching hardware, so
+        each listed one is verified with a tiny test encode.
+        
+        Returns:
+            Set of usable encoder names
+        """
         try:
-            # Try to get ffmpeg version to check if it's installed
             result = subprocess.run(
-                ['ffmpeg', '-version'], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
+                [self.ffmpeg_path, '-hide_banner', '-encoders'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 check=False
             )
-            if result.returncode == 0:
-                return 'ffmpeg'
         except Exception as e:
-            logger.debug(f"Error checking ffmpeg: {e}")
+            logger.debug(f"Error listing ffmpeg encoders: {e}")
+            return set()
         
-        # Try common installation paths
-        common_paths = [
-            os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'ffmpeg', 'bin', 'ffmpeg.exe'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'), 'ffmpeg', 'bin', 'ffmpeg.exe'),
-            os.path.join(os.path.expanduser('~'), 'ffmpeg', 'bin', 'ffmpeg.exe')
-        ]
+        listed = {line.split()[1] for line in result.stdout.splitlines()
+                  if len(line.split()) > 1}
         
-        for path in common_paths:
-            if os.path.isfile(path):
-                return path
+        usable = set()
+        for candidates in self.ACCELERATED_ENCODERS.values():
+            for name in candidates:
+                if name not in listed:
+                    continue
+                if self._test_encoder(name):
+                    usable.add(name)
+                    break
         
-        return None
+        return usable
+    
+    def _test_encoder(self, name: str) -> bool:
+        """Check that an encoder works by encoding a few blank frames"""
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                 '-c:v', name, '-f', 'null', '-'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+                check=False
+            )
+            return result.returncode == 0
+        except Exception as e:
+            logger.debug(f"Error testing encoder {name}: {e}")
+            return False
+    
+    def _video_codec_args(self, vcodec: str, quality_settings: Dict) -> List[str]:
+        """Translate CRF/preset quality settings into ffmpeg options for the given encoder"""
+        crf = quality_settings['crf']
+        preset = quality_settings['preset']
+        
+        if vcodec.endswith('_nvenc'):
+            return ['-c:v', vcodec, '-rc', 'vbr', '-cq', str(crf), '-b:v', '0',
+                    '-preset', self.NVENC_PRESETS.get(preset, 'p4')]
+        if vcodec.endswith('_qsv'):
+            return ['-c:v', vcodec, '-global_quality', str(crf), '-preset', preset]
+        if vcodec.endswith('_amf'):
+            return ['-c:v', vcodec, '-rc', 'cqp', '-qp_i', str(crf), '-qp_p', str(crf)]
+        if vcodec == 'libvpx-vp9':
+            # -b:v 0 selects constant quality; without it CRF is capped by a default bitrate
+            return ['-c:v', vcodec, '-crf', str(crf), '-b:v', '0', *self._vp9_speed_args(preset)]
+        return ['-c:v', vcodec, '-crf', str(crf), '-preset', preset]
+    
+    def _vp9_speed_args(self, preset: str) -> List[str]:
+        """libvpx-vp9 speed options: without row-mt and tiles VP9 barely uses more than one core"""
+        return ['-deadline', 'good', '-cpu-used', str(self.VP9_CPU_USED.get(preset, 2)),
+                '-row-mt', '1', '-tile-columns', '2']
+    
+    def _input_args(self, vcodec: Optional[str]) -> List[str]:
+        """Input options that let the decoder run on the same GPU as the encoder"""
+        if vcodec and vcodec.endswith('_nvenc'):
+            # Frames come back to system memory for the CPU fps/scale filters
+            return ['-hwaccel', 'cuda']
+        return []
+    
+    def _scale_filter(self, quality_settings: Dict) -> str:
+        """Build the scale filter for a quality preset"""
+        if 'resolution' in quality_settings:
+            width, height = quality_settings['resolution'].split('x')
+            return f"scale={width}:{height}"
+        # Just ensure even dimensions
+        return "scale=trunc(iw/2)*2:trunc(ih/2)*2"
+    
+    def _video_filter(self, quality_settings: Dict, fps: float) -> str:
+        """Build the -vf filtergraph: drop frames first so the scaler only sees kept ones"""
+        return f"fps={fps},{self._scale_filter(quality_settings)}"
+    
+    def _output_codecs(self, output_format: str) -> Tuple[Optional[str], List[str]]:
+        """Look up the codec family and audio options for an output container
+        
+        Returns:
+            Tuple of (codec family or None for ffmpeg's default, audio options)
+        """
+        family, acodec = self.OUTPUT_CODECS.get(output_format, (None, None))
+        if family is None:
+            return None, []
+        return family, ['-c:a', acodec, '-b:a', self.AUDIO_BITRATE]
+    
+    def _build_argv(self, quality: str, output_format: str) -> Tuple[List[str], List[str], bool]:
+        """Build the constant part of a quality-based ffmpeg command
+        
+        The result depends only on the quality preset and output format, so
+        it is built once per combination and reused for every file.
+        
+        Args:
+            quality: Quality preset name
+            output_format: Output format (without dot)
+            
+        Returns:
+            Tuple of (input options, output options, whether to apply the video filter)
+        """
+        key = (quality, output_format)
+        if key not in self._argv_cache:
+            quality_settings = self.QUALITY_PRESETS.get(quality, self.QUALITY_PRESETS['medium'])
+            family, audio_args = self._output_codecs(output_format)
+            
+            if family:
+                vcodec = self.preferred_vcodec[family]
+                self._argv_cache[key] = (
+                    self._input_args(vcodec),
+                    [*self._video_codec_args(vcodec, quality_settings), *audio_args],
+                    True
+                )
+            else:
+                self._argv_cache[key] = (
+                    [],
+                    ['-preset', quality_settings['preset']],
+                    False
+                )
+        return self._argv_cache[key]
+    
+    def _ffmpeg_argv(self, *args: str) -> List[str]:
+        """Full ffmpeg command line for the given arguments, overwriting existing outputs
+        
+        Only errors are logged, so almost nothing flows over the stderr pipe
+        during a successful encode.
+        """
+        return [self.ffmpeg_path or 'ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error', '-y', *args]
+    
+    def _run_ffmpeg(self, *args: str, progress: Optional[Callable[[float], Optional[bool]]] = None) -> Tuple[bool, str]:
+        """Run ffmpeg with the given arguments and wait for it
+        
+        Args:
+            progress: Called with the seconds of output encoded so far (if None, not reported)
+            
+        Returns:
+            Tuple of (success: bool, error output: str)
+        """
+        if progress is not None:
+            return self._run_ffmpeg_progress(args, progress)
+        try:
+            result = subprocess.run(
+                self._ffmpeg_argv(*args),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=False
+            )
+        except OSError as e:
+            return False, f"Could not run ffmpeg: {e}"
+        if result.returncode != 0:
+            return False, result.stderr.decode(errors='replace')
+        return True, ''
+    
+    def _run_ffmpeg_progress(self, args, progress: Callable[[float], Optional[bool]]) -> Tuple[bool, str]:
+        """Run ffmpeg, reading its -progress key=value output line by line
+        
+        Args:
+            args: ffmpeg arguments
+            progress: Called with the seconds of output encoded so far; returning False stops ffmpeg
+            
+        Returns:
+            Tuple of (success: bool, error output: str)
+        """
+        try:
+            # stderr goes to a file so a chatty ffmpeg can't block on a full pipe we aren't reading
+            with tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(
+                    self._ffmpeg_argv('-progress', 'pipe:1', *args),
+                    stdout=subprocess.PIPE,
+                    stderr=stderr
+                )
+                try:
+                    for line in process.stdout:
+                        # out_time_ms is in microseconds despite its name
+                        if line.startswith(b'out_time_ms='):
+                            try:
+                                seconds = int(line[12:]) / 1000000
+                            except ValueError:
+                                continue  # N/A before the first frame
+                            if progress(seconds) is False:
+                                process.kill()
+                                process.wait()
+                                return False, "Encoding cancelled"
+                    process.wait()
+                finally:
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+                    process.stdout.close()
+                if process.returncode != 0:
+                    stderr.seek(0)
+                    return False, stderr.read().decode(errors='replace')
+                return True, ''
+        except OSError as e:
+            return False, f"Could not run ffmpeg: {e}"
+    
+    def _progress_reporter(self, duration: float, callback: Callable[[int], Optional[bool]],
+                           passes: int = 1) -> Callable[[int], Callable[[float], Optional[bool]]]:
+        """Turn ffmpeg's encoded-seconds reports into whole-percent callbacks
+        
+        Each of the passes gets an equal share of the range, so a two-pass
+        encode reports 0-50% in pass 1 and 50-100% in pass 2.
+        
+        Args:
+            duration: Input duration in seconds (if 0, progress stays at 0%)
+            callback: Called with the percentage (0-100) only when it changes; returning False stops ffmpeg
+            passes: Number of ffmpeg runs over the whole input
+            
+        Returns:
+            Function taking a pass index (0-based) and returning its progress function for _run_ffmpeg
+        """
+        last_percent = None
+        
+        def for_pass(index: int) -> Callable[[float], Optional[bool]]:
+            def report(seconds: float) -> Optional[bool]:
+                nonlocal last_percent
+                percent = min(100, int(seconds * 100 / duration)) if duration > 0 else 0
+                percent = (min(index, passes - 1) * 100 + percent) // passes
+                if percent == last_percent:
+                    return None
+                last_percent = percent
+                return callback(percent)
+            return report
+        
+        return for_pass
+    
+    async def _run_ffmpeg_async(self, *args: str, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Run ffmpeg with the given arguments without blocking the event loop
+        
+        Args:
+            timeout: Seconds to wait before killing ffmpeg (if None, wait indefinitely)
+            
+        Returns:
+            Tuple of (success: bool, error output: str)
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._ffmpeg_argv(*args),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except OSError as e:
+            return False, f"Could not run ffmpeg: {e}"
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False, f"FFmpeg timed out after {timeout} seconds"
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            return False, stderr.decode(errors='replace')
+        return True, ''
+    
+    def _drive(self, steps, progress: Optional[Callable[[int], Callable[[float], Optional[bool]]]] = None) -> Tuple[bool, str]:
+        """Run the ffmpeg commands a conversion generator yields, one after another
+        
+        Args:
+            steps: Conversion generator
+            progress: Called with each ffmpeg run's index to get its progress function (see _progress_reporter)
+            
+        Returns:
+            The (success, message) tuple the generator returns
+        """
+        result = None
+        index = 0
+        try:
+            while True:
+                args = steps.send(result)
+                result = self._run_ffmpeg(*args, progress=progress(index) if progress else None)
+                index += 1
+        except StopIteration as stop:
+            return stop.value
+    
+    async def _drive_async(self, steps, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Asynchronous counterpart of _drive"""
+        result = None
+        try:
+            while True:
+                result = await self._run_ffmpeg_async(*steps.send(result), timeout=timeout)
+        except StopIteration as stop:
+            return stop.value
+    
+    def _discard_output(self, output_path: str):
+        """Delete what a failed or cancelled ffmpeg run left at output_path
+        
+        ffmpeg stopped mid-write leaves an unplayable file (e.g. an mp4 without
+        its moov atom), which would also keep the output name reserved.
+        """
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove incomplete output {output_path}: {e}")
+    
+    def _ensure_dir(self, directory: str):
+        """Create an output directory unless it was already created by this encoder"""
+        if directory and directory not in self._known_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
     
     def is_supported_format(self, file_path: str) -> bool:
         """Check if the file format is supported"""
-        ext = os.path.splitext(file_path)[1].lower()
-        return ext in self.SUPPORTED_FORMATS
+        _, dot, ext = os.fspath(file_path).rpartition('.')
+        # A dot inside a directory name leaves a separator in ext, which never matches
+        return bool(dot) and f".{ext.lower()}" in self.SUPPORTED_FORMATS
     
     def get_video_info(self, input_path: str) -> Dict:
-        """Get video file information using ffprobe"""
+        """Get video file information using ffprobe
+        
+        Results are cached per file and reused until the file's size or
+        modification time changes.
+        """
         try:
-            probe = ffmpeg.probe(input_path)
+            stats = os.stat(input_path)
+            cache_key = (input_path, stats.st_mtime_ns, stats.st_size)
+        except OSError:
+            cache_key = None
+        
+        if cache_key in self._probe_cache:
+            return dict(self._probe_cache[cache_key])
+        
+        try:
+            result = subprocess.run(
+                [self.ffprobe_path or 'ffprobe', '-v', 'error', '-print_format', 'json',
+                 '-show_format', '-show_streams', input_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"ffprobe error: {result.stderr.decode(errors='replace').strip()}")
+            probe = loads_json(result.stdout)
             video_info = next((stream for stream in probe['streams'] 
                               if stream['codec_type'] == 'video'), None)
             
             if not video_info:
                 raise ValueError("No video stream found")
+            
+            # Parse frame rate string (e.g. '24/1') to float
+            frame_rate = video_info.get('avg_frame_rate', '0/1')
+            try:
+                num, _, den = frame_rate.partition('/')
+                fps = int(num) / int(den) if den and int(den) else float(frame_rate)
+            except (ValueError, ZeroDivisionError):
+                fps = 0.0
                 
-            return {
+            info = {
                 'width': int(video_info.get('width', 0)),
                 'height': int(video_info.get('height', 0)),
                 'duration': float(probe.get('format', {}).get('duration', 0)),
                 'bitrate': int(probe.get('format', {}).get('bit_rate', 0)),
                 'size': int(probe.get('format', {}).get('size', 0)),
                 'codec': video_info.get('codec_name', 'unknown'),
-                'fps': self._parse_frame_rate(video_info.get('avg_frame_rate', '0/1'))
+                'fps': fps
             }
+            if cache_key is not None:
+                self._probe_cache[cache_key] = info
+            return dict(info)
         except Exception as e:
             logger.error(f"Error getting video info: {e}")
             return {}
     
-    def _parse_frame_rate(self, frame_rate_str: str) -> float:
-        """Parse frame rate string (e.g. '24/1') to float"""
-        try:
-            if '/' in frame_rate_str:
-                num, den = map(int, frame_rate_str.split('/'))
-                return num / den if den else 0
-            return float(frame_rate_str)
-        except (ValueError, ZeroDivisionError):
-            return 0.0
+    def _batch_probe(self, paths: List[str]) -> Dict[str, Dict]:
+        """Probe many files at once, filling the probe cache
+        
+        Each probe blocks on an ffprobe child process, so threads are enough
+        to run them side by side.
+        
+        Returns:
+            Dictionary of path to video info (empty dict if probing failed)
+        """
+        if not paths:
+            return {}
+        probe_queue = self._get_probe_queue()
+        futures = []
+        for path in paths:
+            future = Future()
+            probe_queue.put((path, future))
+            futures.append(future)
+        return {path: future.result() for path, future in zip(paths, futures)}
+    
+    def prefetch_video_info(self, paths: List[str]) -> None:
+        """Probe files in the background so later get_video_info calls hit the cache
+        
+        The paths are queued for the encoder's shared probe workers, so however
+        often this is called, at most PROBE_WORKERS ffprobe processes run.
+        
+        Args:
+            paths: Input file paths
+        """
+        probe_queue = self._get_probe_queue()
+        for path in paths:
+            probe_queue.put((path, None))
+    
+    def _get_probe_queue(self) -> 'queue.Queue':
+        """Get the probe work queue, starting the shared probe workers on first use
+        
+        The workers are daemon threads, so queued prefetches never hold up exit.
+        """
+        with self._probe_lock:
+            if self._probe_queue is None:
+                self._probe_queue = queue.Queue()
+                for index in range(self.PROBE_WORKERS):
+                    threading.Thread(target=self._probe_worker, name=f'probe-{index}',
+                                     daemon=True).start()
+            return self._probe_queue
+    
+    def _probe_worker(self):
+        """Probe queued paths, handing results to a waiting caller when there is one"""
+        probe_queue = self._probe_queue
+        while True:
+            path, future = probe_queue.get()
+            try:
+                info = self.get_video_info(path)
+            except Exception as e:
+                logger.error(f"Error probing {path}: {e}")
+                info = {}
+            if future is not None:
+                future.set_result(info)
     
     def convert_video(self, input_path: str, output_path: str, 
                       quality: str = 'medium', target_size: Optional[int] = None,
-                      output_format: Optional[str] = None) -> Tuple[bool, str]:
+                      output_format: Optional[str] = None,
+                      threads: Optional[int] = None,
+                      video_info: Optional[Dict] = None,
+                      progress_callback: Optional[Callable[[int], Optional[bool]]] = None) -> Tuple[bool, str]:
         """Convert video with specified parameters
         
         Args:
@@ -133,10 +641,50 @@ class VideoEncoder:
             quality: Quality preset (very_low, low, medium, high, very_high, 144p, 240p, etc.)
             target_size: Target file size in MB (if specified, overrides quality settings)
             output_format: Output format (if None, inferred from output_path)
+            threads: Limit for ffmpeg encoder threads (if None, ffmpeg decides)
+            video_info: Already probed info for input_path (if None, probed on demand)
+            progress_callback: Called with the percentage done when it changes (two-pass
+                encodes spread both passes over 0-100); returning False cancels the conversion
             
         Returns:
             Tuple of (success: bool, message: str)
         """
+        progress = None
+        if progress_callback is not None:
+            if not video_info:
+                video_info = self.get_video_info(input_path)
+            passes = self._pass_count(output_path, target_size, output_format)
+            progress = self._progress_reporter(video_info.get('duration', 0), progress_callback, passes)
+        return self._drive(self._convert_steps(input_path, output_path, quality, target_size,
+                                               output_format, threads, video_info),
+                           progress)
+    
+    async def convert_video_async(self, input_path: str, output_path: str,
+                                  quality: str = 'medium', target_size: Optional[int] = None,
+                                  output_format: Optional[str] = None,
+                                  threads: Optional[int] = None,
+                                  video_info: Optional[Dict] = None,
+                                  timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Convert video like convert_video, awaiting ffmpeg instead of blocking
+        
+        Args:
+            timeout: Seconds to allow each ffmpeg run (if None, no limit)
+            
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        return await self._drive_async(self._convert_steps(input_path, output_path, quality, target_size,
+                                                           output_format, threads, video_info),
+                                       timeout)
+    
+    def _convert_steps(self, input_path: str, output_path: str, quality: str,
+                       target_size: Optional[int], output_format: Optional[str],
+                       threads: Optional[int], video_info: Optional[Dict]):
+        """Generator behind convert_video: yields ffmpeg arguments, receives (success, error output)
+        
+        Returns:
+            Tuple of (success: bool, message: str) when exhausted
+        """
         try:
             if not os.path.exists(input_path):
                 return False, f"Input file does not exist: {input_path}"
@@ -154,77 +702,42 @@ class VideoEncoder:
                     output_format = 'mp4'  # Default to mp4
             
             # Ensure output directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-            
-            # Start with base conversion
-            stream = ffmpeg.input(input_path)
+            self._ensure_dir(os.path.dirname(os.path.abspath(output_path)))
             
             # Apply encoding settings
             if target_size:
                 # If target size specified, use two-pass encoding to achieve target size
-                return self._encode_with_target_size(input_path, output_path, target_size, output_format, quality_settings)
+                return (yield from self._target_size_steps(input_path, output_path, target_size, output_format,
+                                                           quality_settings, threads, video_info))
             else:
                 # Standard quality-based encoding
-                video = stream.video.filter('fps', fps=self._get_optimal_fps(input_path))
-                
-                # Apply resolution if specified in quality preset
-                if 'resolution' in quality_settings:
-                    width, height = quality_settings['resolution'].split('x')
-                    video = video.filter('scale', width, height)
-                else:
-                    # Just ensure even dimensions
-                    video = video.filter('scale', 'trunc(iw/2)*2', 'trunc(ih/2)*2')
-                
-                # Apply encoding settings based on format
-                if output_format in ['mp4', 'mkv', 'mov']:
-                    stream = ffmpeg.output(
-                        video,
-                        stream.audio,
-                        output_path,
-                        vcodec='libx264',
-                        crf=quality_settings['crf'],
-                        preset=quality_settings['preset'],
-                        acodec='aac',
-                        audio_bitrate='128k'
-                    )
-                elif output_format == 'webm':
-                    stream = ffmpeg.output(
-                        video,
-                        stream.audio,
-                        output_path,
-                        vcodec='libvpx-vp9',
-                        crf=quality_settings['crf'],
-                        preset=quality_settings['preset'],
-                        acodec='libopus',
-                        audio_bitrate='128k'
-                    )
-                else:
-                    # Generic fallback
-                    stream = ffmpeg.output(
-                        stream.video,
-                        stream.audio,
-                        output_path,
-                        preset=quality_settings['preset']
-                    )
+                input_args, output_args, filtered = self._build_argv(quality, output_format)
+                filter_args = []
+                if filtered:
+                    fps = self._get_optimal_fps(input_path, video_info)
+                    filter_args = ['-vf', self._video_filter(quality_settings, fps)]
+                thread_args = ['-threads', str(threads)] if threads else []
                 
                 # Run the conversion
-                stream = stream.global_args('-y')  # Overwrite output files
-                stream.run(capture_stdout=True, capture_stderr=True)
+                success, error_message = yield (
+                    *input_args, '-i', input_path, *filter_args,
+                    '-map', '0:v:0', '-map', '0:a?', *output_args, *thread_args, output_path
+                )
+                if not success:
+                    self._discard_output(output_path)
+                    logger.error(f"FFmpeg error: {error_message}")
+                    return False, f"FFmpeg error: {error_message}"
                 
                 return True, f"Successfully converted video to {output_path}"
                 
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if hasattr(e, 'stderr') else str(e)
-            logger.error(f"FFmpeg error: {error_message}")
-            return False, f"FFmpeg error: {error_message}"
         except Exception as e:
             logger.error(f"Error converting video: {e}", exc_info=True)
             return False, f"Error: {str(e)}"
     
-    def _get_optimal_fps(self, input_path: str) -> int:
-        """Get optimal FPS for the output based on input video"""
+    def _get_optimal_fps(self, input_path: str, video_info: Optional[Dict] = None) -> float:
+        """Get optimal FPS for the output based on input video (resolve once per file and reuse)"""
         try:
-            info = self.get_video_info(input_path)
+            info = video_info if video_info else self.get_video_info(input_path)
             original_fps = info.get('fps', 0)
             
             # Keep original FPS if it's reasonable
@@ -237,16 +750,36 @@ class VideoEncoder:
         except Exception:
             return 30  # Default to 30fps on error
     
-    def _encode_with_target_size(self, input_path: str, output_path: str, 
-                               target_size_mb: int, output_format: str,
-                               quality_settings: Dict = None) -> Tuple[bool, str]:
-        """Encode video targeting a specific file size using two-pass encoding"""
+    def _hardware_vcodec(self, family: Optional[str]) -> Optional[str]:
+        """Accelerated encoder to use for a codec family, or None when encoding in software"""
+        vcodec = self.preferred_vcodec[family] if family else None
+        return vcodec if vcodec and not vcodec.startswith('lib') else None
+    
+    def _pass_count(self, output_path: str, target_size: Optional[int],
+                    output_format: Optional[str]) -> int:
+        """Number of ffmpeg runs a convert_video call makes (two for software target size encodes)"""
+        if not target_size:
+            return 1
+        output_format = output_format or os.path.splitext(output_path)[1].lstrip('.') or 'mp4'
+        family, _ = self._output_codecs(output_format)
+        return 1 if self._hardware_vcodec(family) else 2
+    
+    def _target_size_steps(self, input_path: str, output_path: str, 
+                           target_size_mb: int, output_format: str,
+                           quality_settings: Dict = None,
+                           threads: Optional[int] = None,
+                           video_info: Optional[Dict] = None):
+        """Encode video targeting a specific file size (generator, see _convert_steps)
+        
+        Software encoders use two-pass encoding; hardware encoders use a single
+        constrained-VBR pass.
+        """
         try:
             if quality_settings is None:
                 quality_settings = self.QUALITY_PRESETS['medium']
                 
             # Get video info
-            info = self.get_video_info(input_path)
+            info = video_info if video_info else self.get_video_info(input_path)
             duration = info.get('duration', 0)
             
             if duration <= 0:
@@ -261,130 +794,211 @@ class VideoEncoder:
             if video_bitrate <= 0:
                 return False, "Target size too small for this video duration"
             
+            # Filters and codecs
+            video_filter = self._video_filter(quality_settings, self._get_optimal_fps(input_path, info))
+            
+            family, audio_args = self._output_codecs(output_format)
+            
+            bitrate = str(video_bitrate)
+            thread_args = ['-threads', str(threads)] if threads else []
+            
+            # Hardware encoders gain nothing from two passes: one constrained-VBR pass
+            vcodec = self._hardware_vcodec(family)
+            if vcodec:
+                rc_args = ['-rc', 'vbr'] if vcodec.endswith('_nvenc') else []
+                success, error_message = yield (
+                    *self._input_args(vcodec), '-i', input_path,
+                    '-vf', video_filter, '-map', '0:v:0', '-map', '0:a?',
+                    '-c:v', vcodec, *rc_args,
+                    '-b:v', bitrate, '-maxrate', bitrate, '-bufsize', str(video_bitrate * 2),
+                    *audio_args, *thread_args, output_path
+                )
+                if not success:
+                    self._discard_output(output_path)
+                    logger.error(f"Target size encoding error: {error_message}")
+                    return False, f"Target size encoding error: {error_message}"
+                return True, f"Successfully converted video to {output_path} with target size {target_size_mb}MB"
+            
+            # Software encoders: classic two-pass. The passes must run one after
+            # the other, because pass 2 reads the statistics pass 1 writes.
+            vcodec_args = ['-c:v', self.SOFTWARE_ENCODERS[family]] if family else []
+            if family == 'webm':
+                vcodec_args += self._vp9_speed_args(quality_settings['preset'])
+            
             # Create temporary directory for pass logs
             with tempfile.TemporaryDirectory() as temp_dir:
                 pass_log_file = os.path.join(temp_dir, "ffmpeg2pass")
                 
-                # First pass
-                stream = ffmpeg.input(input_path)
-                video = stream.video.filter('fps', fps=self._get_optimal_fps(input_path))
-                
-                # Apply resolution if specified in quality preset
-                if 'resolution' in quality_settings:
-                    width, height = quality_settings['resolution'].split('x')
-                    video = video.filter('scale', width, height)
-                else:
-                    video = video.filter('scale', 'trunc(iw/2)*2', 'trunc(ih/2)*2')
-                
-                # First pass - analyze only, no audio
-                if output_format in ['mp4', 'mkv', 'mov']:
-                    first_pass = ffmpeg.output(
-                        video,
-                        None,  # No audio in first pass
-                        os.devnull,  # Output to nowhere
-                        vcodec='libx264',
-                        b=f'{video_bitrate}',
-                        pass_=1,
-                        f='null',
-                        **{'passlogfile': pass_log_file}
-                    )
-                elif output_format == 'webm':
-                    first_pass = ffmpeg.output(
-                        video,
-                        None,  # No audio in first pass
-                        os.devnull,  # Output to nowhere
-                        vcodec='libvpx-vp9',
-                        b=f'{video_bitrate}',
-                        pass_=1,
-                        f='null',
-                        **{'passlogfile': pass_log_file}
-                    )
-                else:
-                    # Generic fallback
-                    first_pass = ffmpeg.output(
-                        video,
-                        None,  # No audio in first pass
-                        os.devnull,  # Output to nowhere
-                        b=f'{video_bitrate}',
-                        pass_=1,
-                        f='null',
-                        **{'passlogfile': pass_log_file}
-                    )
-                
-                # Run first pass
-                try:
-                    first_pass.global_args('-y').run(capture_stdout=True, capture_stderr=True)
-                except ffmpeg.Error as e:
-                    error_message = e.stderr.decode() if hasattr(e, 'stderr') else str(e)
+                # First pass - analyze only, no audio, subtitle or data streams
+                success, error_message = yield (
+                    '-i', input_path, '-vf', video_filter, '-map', '0:v:0', *vcodec_args,
+                    '-b:v', bitrate, '-pass', '1', '-passlogfile', pass_log_file,
+                    *thread_args, '-an', '-sn', '-dn', '-f', 'null', os.devnull
+                )
+                if not success:
                     logger.error(f"First pass encoding error: {error_message}")
                     return False, f"First pass encoding error: {error_message}"
                 
                 # Second pass - with audio
-                stream = ffmpeg.input(input_path)
-                video = stream.video.filter('fps', fps=self._get_optimal_fps(input_path))
-                
-                # Apply resolution if specified in quality preset
-                if 'resolution' in quality_settings:
-                    width, height = quality_settings['resolution'].split('x')
-                    video = video.filter('scale', width, height)
-                else:
-                    video = video.filter('scale', 'trunc(iw/2)*2', 'trunc(ih/2)*2')
-                
-                # Second pass with audio
-                if output_format in ['mp4', 'mkv', 'mov']:
-                    second_pass = ffmpeg.output(
-                        video,
-                        stream.audio,
-                        output_path,
-                        vcodec='libx264',
-                        b=f'{video_bitrate}',
-                        pass_=2,
-                        acodec='aac',
-                        audio_bitrate='128k',
-                        **{'passlogfile': pass_log_file}
-                    )
-                elif output_format == 'webm':
-                    second_pass = ffmpeg.output(
-                        video,
-                        stream.audio,
-                        output_path,
-                        vcodec='libvpx-vp9',
-                        b=f'{video_bitrate}',
-                        pass_=2,
-                        acodec='libopus',
-                        audio_bitrate='128k',
-                        **{'passlogfile': pass_log_file}
-                    )
-                else:
-                    # Generic fallback
-                    second_pass = ffmpeg.output(
-                        video,
-                        stream.audio,
-                        output_path,
-                        b=f'{video_bitrate}',
-                        pass_=2,
-                        **{'passlogfile': pass_log_file}
-                    )
-                
-                # Run second pass
-                try:
-                    second_pass.global_args('-y').run(capture_stdout=True, capture_stderr=True)
-                    return True, f"Successfully converted video to {output_path} with target size {target_size_mb}MB"
-                except ffmpeg.Error as e:
-                    error_message = e.stderr.decode() if hasattr(e, 'stderr') else str(e)
+                success, error_message = yield (
+                    '-i', input_path, '-vf', video_filter, '-map', '0:v:0', '-map', '0:a?',
+                    *vcodec_args, '-b:v', bitrate, '-pass', '2', '-passlogfile', pass_log_file,
+                    *audio_args, *thread_args, output_path
+                )
+                if not success:
+                    self._discard_output(output_path)
                     logger.error(f"Second pass encoding error: {error_message}")
                     return False, f"Second pass encoding error: {error_message}"
                 
+                return True, f"Successfully converted video to {output_path} with target size {target_size_mb}MB"
+                
         except Exception as e:
             logger.error(f"Error in target size encoding: {e}", exc_info=True)
             return False, f"Error: {str(e)}"
     
+    def convert_ladder(self, input_path: str, output_dir: str,
+                       qualities: Optional[List[str]] = None,
+                       output_format: str = 'mp4',
+                       prefix_template: str = "{filename}_{quality}",
+                       threads: Optional[int] = None) -> List[Dict]:
+        """Convert one video to several quality presets with a single decode
+        
+        One ffmpeg process decodes the input once, splits the frames and feeds
+        one encoder per quality, instead of re-decoding the source per output.
+        
+        Args:
+            input_path: Path to input video file
+            output_dir: Directory to save output videos
+            qualities: Quality presets to produce (default: 240p, 480p, 720p, 1080p)
+            output_format: Output format
+            prefix_template: Template for output filenames (should include {quality})
+            threads: Limit for ffmpeg encoder threads (if None, ffmpeg decides)
+            
+        Returns:
+            List of dictionaries with conversion results, one per quality
+        """
+        if qualities is None:
+            qualities = ['240p', '480p', '720p', '1080p']
+        qualities = [quality for quality in qualities if quality in self.QUALITY_PRESETS]
+        output_format = output_format.lstrip('.')
+        
+        def failed(message):
+            return [{'input': input_path, 'output': None, 'quality': quality,
+                     'success': False, 'message': message} for quality in qualities]
+        
+        try:
+            if not qualities:
+                return []
+            
+            if not os.path.exists(input_path):
+                return failed("Input file does not exist")
+            
+            if not self.is_supported_format(input_path):
+                return failed(f"Unsupported input format: {os.path.splitext(input_path)[1]}")
+            
+            self._ensure_dir(output_dir)
+            
+            file_manager = get_file_manager()
+            video_info = self.get_video_info(input_path)
+            fps = self._get_optimal_fps(input_path, video_info)
+            
+            # Drop frames once, then split the decoded stream into one branch per quality
+            labels = [f"v{index}" for index in range(len(qualities))]
+            graph = [f"[0:v]fps={fps},split={len(qualities)}" + ''.join(f"[{label}]" for label in labels)]
+            
+            input_args = []
+            output_paths = []
+            output_args = []
+            thread_args = ['-threads', str(threads)] if threads else []
+            for label, quality in zip(labels, qualities):
+                input_args, codec_args, _ = self._build_argv(quality, output_format)
+                graph.append(f"[{label}]{self._scale_filter(self.QUALITY_PRESETS[quality])}[s{label}]")
+                
+                filename = file_manager.apply_prefix_template(
+                    prefix_template, input_path, video_info, quality
+                )
+                output_path = os.path.join(output_dir, f"{filename}.{output_format}")
+                output_paths.append(output_path)
+                output_args += ['-map', f"[s{label}]", '-map', '0:a?',
+                                *codec_args, *thread_args, output_path]
+            
+            success, error_message = self._run_ffmpeg(
+                *input_args, '-i', input_path,
+                '-filter_complex', ';'.join(graph), *output_args
+            )
+            if not success:
+                logger.error(f"FFmpeg error: {error_message}")
+                return failed(f"FFmpeg error: {error_message}")
+            
+            return [{'input': input_path, 'output': output_path, 'quality': quality,
+                     'success': True, 'message': f"Successfully converted video to {output_path}"}
+                    for quality, output_path in zip(qualities, output_paths)]
+        except Exception as e:
+            logger.error(f"Error in ladder conversion for {input_path}: {e}", exc_info=True)
+            return failed(f"Error: {str(e)}")
+    
+    def convert_videos(self, jobs: List[Tuple[str, str, Optional[Dict]]],
+                       quality: str = 'medium', output_format: str = 'mp4',
+                       threads: Optional[int] = None) -> Tuple[bool, str]:
+        """Convert several videos with one ffmpeg process
+        
+        Each input gets its own -map/-vf/codec output, so process startup and
+        codec initialization are paid once for the whole group. Meant for
+        batches of short clips; one failing input fails the whole group.
+        
+        Args:
+            jobs: List of (input path, output path, probed info or None) tuples
+            quality: Quality preset
+            output_format: Output format (without dot)
+            threads: Limit for ffmpeg encoder threads per output (if None, ffmpeg decides)
+            
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        try:
+            for input_path, output_path, _ in jobs:
+                if not os.path.exists(input_path):
+                    return False, f"Input file does not exist: {input_path}"
+                if not self.is_supported_format(input_path):
+                    return False, f"Unsupported input format: {os.path.splitext(input_path)[1]}"
+                self._ensure_dir(os.path.dirname(os.path.abspath(output_path)))
+            
+            quality_settings = self.QUALITY_PRESETS.get(quality, self.QUALITY_PRESETS['medium'])
+            input_args, codec_args, filtered = self._build_argv(quality, output_format)
+            thread_args = ['-threads', str(threads)] if threads else []
+            
+            inputs = []
+            outputs = []
+            for index, (input_path, output_path, video_info) in enumerate(jobs):
+                inputs += [*input_args, '-i', input_path]
+                filter_args = []
+                if filtered:
+                    fps = self._get_optimal_fps(input_path, video_info)
+                    filter_args = ['-vf', self._video_filter(quality_settings, fps)]
+                outputs += ['-map', f"{index}:v:0", '-map', f"{index}:a?",
+                            *filter_args, *codec_args, *thread_args, output_path]
+            
+            success, error_message = self._run_ffmpeg(*inputs, *outputs)
+            if not success:
+                logger.error(f"FFmpeg error: {error_message}")
+                return False, f"FFmpeg error: {error_message}"
+            
+            return True, f"Successfully converted {len(jobs)} videos"
+        except Exception as e:
+            logger.error(f"Error converting video group: {e}", exc_info=True)
+            return False, f"Error: {str(e)}"
+    
     def batch_convert(self, input_files: List[str], output_dir: str, 
                      quality: str = 'medium', output_format: str = 'mp4',
                      target_size: Optional[int] = None,
-                     prefix_template: str = "{filename}") -> List[Dict]:
+                     prefix_template: str = "{filename}",
+                     workers: Optional[int] = None,
+                     group_size: int = 1) -> List[Dict]:
         """Convert multiple videos with the same settings
         
+        Files are encoded concurrently in separate processes; each ffmpeg
+        instance gets an equal share of the physical CPU cores.
+        
         Args:
             input_files: List of input video file paths
             output_dir: Directory to save output videos
@@ -392,68 +1006,289 @@ class VideoEncoder:
             output_format: Output format
             target_size: Target file size in MB (if specified)
             prefix_template: Template for output filename
+            workers: Number of ffmpeg processes to run at once (default: a quarter of the CPU cores)
+            group_size: Files to encode per ffmpeg process (default: 1). Larger
+                groups save process startup for short clips; target size
+                encoding always uses one file per process
             
         Returns:
-            List of dictionaries with conversion results
+            List of dictionaries with conversion results, in input order
         """
-        results = []
+        if group_size < 2 or target_size:
+            group_size = 1
+        
+        cpu_count = self.physical_cores
+        if workers is None:
+            # x264 already scales to several threads per encode
+            workers = max(1, cpu_count // 4)
+        workers = max(1, min(workers, -(-len(input_files) // group_size)))
+        threads = max(1, cpu_count // workers)
+        
+        args = (quality, output_format, target_size, threads)
+        
+        # Probe everything up front; workers get the results instead of probing again
+        video_infos = self._batch_probe(input_files)
+        try:
+            self._ensure_dir(os.path.abspath(output_dir))
+        except OSError as e:
+            # Each file reports the failure in its own result
+            logger.error(f"Error creating output directory {output_dir}: {e}")
+        
+        # Output paths are handed out here, in input order: worker processes each
+        # have their own FileManager, so their {counter} values and reserved
+        # names would clash
+        jobs = _batch_jobs(self, input_files, output_dir, quality, output_format,
+                           prefix_template, video_infos)
+        groups = [jobs[start:start + group_size]
+                  for start in range(0, len(jobs), group_size)]
+        
+        if workers == 1:
+            results = []
+            for group in groups:
+                results += _convert_group(group, *args, encoder=self)
+            return results
+        
+        # Detect accelerated encoders here once; workers reuse the result
+        hw_encoders = self.hw_encoders
         
-        for input_path in input_files:
+        results = [None] * len(groups)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_convert_group, group, *args, hw_encoders=hw_encoders): index
+                for index, group in enumerate(groups)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Error in batch conversion for {groups[index]}: {e}", exc_info=True)
+                    results[index] = [{
+                        'input': input_path,
+                        'success': False,
+                        'message': f"Error: {str(e)}"
+                    } for input_path, _, _ in groups[index]]
+        
+        return [result for group_results in results for result in group_results]
+    
+    async def batch_convert_async(self, input_files: List[str], output_dir: str,
+                                  quality: str = 'medium', output_format: str = 'mp4',
+                                  target_size: Optional[int] = None,
+                                  prefix_template: str = "{filename}",
+                                  workers: Optional[int] = None,
+                                  timeout: Optional[float] = None) -> List[Dict]:
+        """Convert multiple videos with the same settings from an event loop
+        
+        Each file is a coroutine awaiting its ffmpeg process, so no thread or
+        worker process waits on an encode; a semaphore caps how many ffmpeg
+        processes run at once.
+        
+        Args:
+            input_files: List of input video file paths
+            output_dir: Directory to save output videos
+            quality: Quality preset
+            output_format: Output format
+            target_size: Target file size in MB (if specified)
+            prefix_template: Template for output filename
+            workers: Number of ffmpeg processes to run at once (default: a quarter of the CPU cores)
+            timeout: Seconds to allow each ffmpeg run (if None, no limit)
+            
+        Returns:
+            List of dictionaries with conversion results, in input order
+        """
+        cpu_count = self.physical_cores
+        if workers is None:
+            workers = max(1, cpu_count // 4)
+        workers = max(1, min(workers, len(input_files) or 1))
+        threads = max(1, cpu_count // workers)
+        semaphore = asyncio.Semaphore(workers)
+        
+        try:
+            self._ensure_dir(os.path.abspath(output_dir))
+        except OSError as e:
+            logger.error(f"Error creating output directory {output_dir}: {e}")
+        
+        # Probing and output naming block on ffprobe, so they run on the default executor
+        def prepare():
+            video_infos = self._batch_probe(input_files)
+            return _batch_jobs(self, input_files, output_dir, quality, output_format,
+                               prefix_template, video_infos)
+        
+        loop = asyncio.get_running_loop()
+        jobs = await loop.run_in_executor(None, prepare)
+        
+        async def convert(input_path, output_path, video_info):
             try:
-                if not os.path.exists(input_path):
-                    results.append({
+                if output_path is None:
+                    return {
                         'input': input_path,
                         'success': False,
-                        'message': f"Input file does not exist"
-                    })
-                    continue
+                        'message': "Input file does not exist"
+                    }
                 
-                # Generate output filename using prefix template
-                try:
-                    from .file_manager import FileManager
-                    file_manager = FileManager()
-                    
-                    # Get video info for template
-                    video_info = self.get_video_info(input_path)
-                    
-                    # Apply template - directly use the template string
-                    # This allows for custom templates like "{filename} {quality}"
-                    filename = file_manager.apply_prefix_template(
-                        prefix_template, input_path, video_info, quality
+                async with semaphore:
+                    success, message = await self.convert_video_async(
+                        input_path, output_path, quality, target_size, output_format,
+                        threads, video_info, timeout
                     )
-                    
-                    # Add extension
-                    output_filename = f"{filename}.{output_format.lstrip('.')}"
-                    output_path = os.path.join(output_dir, output_filename)
-                except Exception as e:
-                    logger.error(f"Error applying filename template: {e}", exc_info=True)
-                    # Fallback to basic filename
-                    filename = os.path.basename(input_path)
-                    name, _ = os.path.splitext(filename)
-                    output_filename = f"{name}.{output_format.lstrip('.')}"
-                    output_path = os.path.join(output_dir, output_filename)
                 
-                # Convert the video
-                success, message = self.convert_video(
-                    input_path, output_path, quality, target_size, output_format
-                )
-                
-                results.append({
+                return {
                     'input': input_path,
                     'output': output_path if success else None,
                     'success': success,
                     'message': message
-                })
-                
+                }
             except Exception as e:
                 logger.error(f"Error in batch conversion for {input_path}: {e}", exc_info=True)
-                results.append({
+                return {
                     'input': input_path,
                     'success': False,
                     'message': f"Error: {str(e)}"
-                })
+                }
+        
+        return list(await asyncio.gather(*(convert(*job) for job in jobs)))
+
+
+def _make_output_path(encoder: VideoEncoder, input_path: str, output_dir: str,
+                      quality: str, output_format: str, prefix_template: str,
+                      video_info: Optional[Dict] = None) -> Tuple[str, Optional[Dict]]:
+    """Build and reserve the output path for a batch input from the prefix template
+    
+    Returns:
+        Tuple of (output path, video info used for the template)
+    """
+    try:
+        # Get video info for template
+        if not video_info:
+            video_info = encoder.get_video_info(input_path)
+        
+        # Apply the template and reserve the name, so no other file in the
+        # batch is given the same output
+        output_path = get_file_manager().generate_output_path(
+            input_path, output_dir, prefix_template, output_format, video_info, quality
+        )
+        return output_path, video_info
+    except Exception as e:
+        logger.error(f"Error applying filename template: {e}", exc_info=True)
+        # Fallback to basic filename
+        filename = os.path.basename(input_path)
+        name, _ = os.path.splitext(filename)
+        output_filename = f"{name}.{output_format.lstrip('.')}"
+        return os.path.join(output_dir, output_filename), video_info
+
+
+def _batch_jobs(encoder: VideoEncoder, input_files: List[str], output_dir: str,
+                quality: str, output_format: str, prefix_template: str,
+                video_infos: Dict[str, Dict]) -> List[Tuple[str, Optional[str], Optional[Dict]]]:
+    """Work out every batch input's output path, in input order
+    
+    Returns:
+        List of (input path, output path or None if the input is missing, video info) tuples
+    """
+    jobs = []
+    for input_path in input_files:
+        if not os.path.exists(input_path):
+            jobs.append((input_path, None, None))
+            continue
+        jobs.append((input_path, *_make_output_path(
+            encoder, input_path, output_dir, quality, output_format,
+            prefix_template, video_infos.get(input_path)
+        )))
+    return jobs
+
+
+def _convert_group(jobs: List[Tuple[str, Optional[str], Optional[Dict]]],
+                   quality: str, output_format: str, target_size: Optional[int],
+                   threads: Optional[int] = None,
+                   encoder: Optional[VideoEncoder] = None,
+                   hw_encoders: Optional[frozenset] = None) -> List[Dict]:
+    """Convert a group of files with one ffmpeg process for batch_convert
+    
+    If the shared process fails, the files are retried one by one so each
+    gets its own result and error message.
+    
+    Args:
+        jobs: (input path, output path, probed info) tuples from _batch_jobs
+        encoder: Encoder to use (default: the process-wide singleton)
+        hw_encoders: Accelerated encoders detected by the parent process (if None,
+            detected here when needed)
+        
+    Returns:
+        List of dictionaries with conversion results, in input order
+    """
+    if encoder is None:
+        encoder = get_encoder()
+    if hw_encoders is not None:
+        encoder.set_hw_encoders(hw_encoders)
+    
+    def convert_each():
+        return [_convert_one(input_path, output_path, quality, output_format, target_size,
+                             threads, video_info, encoder)
+                for input_path, output_path, video_info in jobs]
+    
+    if len(jobs) == 1 or target_size or any(output_path is None for _, output_path, _ in jobs):
+        return convert_each()
+    
+    # The group's encoders run side by side, so they share the thread budget
+    group_threads = max(1, threads // len(jobs)) if threads else None
+    success, message = encoder.convert_videos(jobs, quality, output_format.lstrip('.'), group_threads)
+    if not success:
+        logger.warning(f"Grouped conversion failed, converting files one by one: {message}")
+        return convert_each()
+    
+    return [{
+        'input': input_path,
+        'output': output_path,
+        'success': True,
+        'message': f"Successfully converted video to {output_path}"
+    } for input_path, output_path, _ in jobs]
+
+
+def _convert_one(input_path: str, output_path: Optional[str], quality: str, output_format: str,
+                 target_size: Optional[int],
+                 threads: Optional[int] = None,
+                 video_info: Optional[Dict] = None,
+                 encoder: Optional[VideoEncoder] = None) -> Dict:
+    """Convert a single file for batch_convert
+    
+    Args:
+        output_path: Output path from _batch_jobs (None if the input was missing)
+        video_info: Already probed info for input_path (if None, probed here)
+        encoder: Encoder to use (default: the process-wide singleton)
+        
+    Returns:
+        Dictionary with the conversion result
+    """
+    try:
+        if encoder is None:
+            encoder = get_encoder()
+        
+        if output_path is None or not os.path.exists(input_path):
+            return {
+                'input': input_path,
+                'success': False,
+                'message': f"Input file does not exist"
+            }
+        
+        # Convert the video
+        success, message = encoder.convert_video(
+            input_path, output_path, quality, target_size, output_format, threads, video_info
+        )
+        
+        return {
+            'input': input_path,
+            'output': output_path if success else None,
+            'success': success,
+            'message': message
+        }
         
-        return results
+    except Exception as e:
+        logger.error(f"Error in batch conversion for {input_path}: {e}", exc_info=True)
+        return {
+            'input': input_path,
+            'success': False,
+            'message': f"Error: {str(e)}"
+        }
 
 
 # Singleton instance
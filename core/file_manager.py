@@ -8,14 +8,45 @@ Handles file operations and prefix logic for the video encoder application
 
 import os
 import re
-import time
+import functools
 import logging
+import threading
 import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .fast_stat import FileStat, stat_size_ctime
 
 logger = logging.getLogger('video_encoder.core.file_manager')
 
+# Characters not allowed in filenames on common platforms
+_UNSAFE_CHARS_RE = re.compile(r'[\\/*?:"<>|]')
+
+# Placeholder names used in a template
+_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(template: str) -> Tuple[Tuple[str, ...], frozenset]:
+    """Split a template once into alternating literal text and placeholder names
+    
+    Returns:
+        Tuple of (parts, placeholder names); odd-indexed parts are placeholder names
+    """
+    parts = tuple(_PLACEHOLDER_RE.split(template))
+    return parts, frozenset(parts[1::2])
+
+
+@functools.lru_cache(maxsize=4096)
+def _safe_filename(filename: str) -> str:
+    """Cached worker for FileManager.get_safe_filename"""
+    # Most names are already safe; return them without building a new string
+    if (filename and not _UNSAFE_CHARS_RE.search(filename)
+            and filename[0] not in '. ' and filename[-1] not in '. '):
+        return filename
+    # Replace invalid characters with underscore, remove leading/trailing
+    # whitespace and dots, and ensure filename is not empty
+    return _UNSAFE_CHARS_RE.sub('_', filename).strip('. ') or 'unnamed_file'
+
 
 class FileManager:
     """Handles file operations and naming logic for the video encoder"""
@@ -38,41 +69,112 @@ class FileManager:
         '{source_full}': 'Full source directory path'
     }
     
+    # Placeholder names without braces, for validation
+    VALID_PLACEHOLDERS = frozenset(key[1:-1] for key in PREFIX_PLACEHOLDERS)
+    
+    # Placeholders filled from the input file's stat result
+    STAT_PLACEHOLDERS = frozenset({'size', 'create_date'})
+    
     def __init__(self):
         """Initialize the file manager"""
-        self.counter = 1
+        self.counter = 1  # Next value for the {counter} placeholder
+        self._counter_lock = threading.Lock()
+        # Output directory -> names already present or handed out by generate_output_path
+        self._reserved_outputs = {}
+        # Writability per real directory path, probed once each
+        self._writable_cache = {}
+        # Input path -> stat result read ahead by prefetch, used once
+        self._stat_cache = {}
+    
+    def _safe_stat(self, path) -> Optional[FileStat]:
+        """Get a path's size and change time, returning None if it cannot be accessed"""
+        stats = self._stat_cache.pop(path, None)
+        if stats is not None:
+            return stats
+        return stat_size_ctime(path)
+    
+    def prefetch(self, paths: Iterable[str], max_inflight: int = 64) -> threading.Thread:
+        """Read file metadata for a batch in the background
+        
+        Stats run on a thread pool with at most max_inflight pending at once, so
+        get_file_info and templates find the results ready instead of waiting on
+        the filesystem (noticeable on NFS/SMB).
+        
+        Args:
+            paths: Input file paths, in the order they will be processed
+            max_inflight: Maximum number of stat calls submitted at a time
+            
+        Returns:
+            The started daemon thread
+        """
+        paths = list(paths)
+        
+        def run():
+            with ThreadPoolExecutor(max_workers=min(32, max_inflight)) as executor:
+                pending = {}
+                for path in paths:
+                    if len(pending) >= max_inflight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._store_prefetched(pending.pop(future), future)
+                    pending[executor.submit(stat_size_ctime, path)] = path
+                for future in list(pending):
+                    self._store_prefetched(pending.pop(future), future)
+        
+        thread = threading.Thread(target=run, name='file-prefetch', daemon=True)
+        thread.start()
+        return thread
+    
+    def _store_prefetched(self, path: str, future):
+        """Keep a finished prefetch result; failures are left for _safe_stat to report"""
+        stats = future.result()
+        if stats is not None:
+            self._stat_cache[path] = stats
     
     def get_safe_filename(self, filename: str) -> str:
         """Convert a filename to a safe version (remove invalid characters)"""
-        # Replace invalid characters with underscore
-        safe_name = re.sub(r'[\\/*?:"<>|]', '_', filename)
-        # Remove leading/trailing whitespace and dots
-        safe_name = safe_name.strip('. ')
-        # Ensure filename is not empty
-        if not safe_name:
-            safe_name = 'unnamed_file'
-        return safe_name
+        return _safe_filename(filename)
+    
+    def get_template_placeholders(self, template: str) -> List[str]:
+        """Get the placeholder names (without braces) used in a template"""
+        return _PLACEHOLDER_RE.findall(template)
+    
+    def template_needs_stat(self, template: str) -> bool:
+        """Check whether applying a template reads the input files' metadata (worth a prefetch)"""
+        return bool(_compile_template(template)[1] & self.STAT_PLACEHOLDERS)
+    
+    def _warn_inaccessible(self, file_path: str):
+        """Log why a file could not be stat()ed (only runs on the failure path)"""
+        if os.path.lexists(file_path):
+            logger.warning("Cannot access file (permission denied?): %s", file_path)
+        else:
+            logger.warning("File does not exist: %s", file_path)
+    
+    @staticmethod
+    def _split_path(file_path: str) -> Tuple[str, str, str]:
+        """Split a path into directory, name without extension and extension (without dot)
+        
+        Plain os.path string operations, without building Path objects.
+        """
+        directory, base = os.path.split(os.fspath(file_path))
+        stem, extension = os.path.splitext(base)
+        return directory or os.curdir, stem, extension[1:]
     
     def get_file_info(self, file_path: str) -> Dict:
         """Get file information for prefix placeholders"""
         try:
-            file_path = Path(file_path)
-            
-            # Check if file exists first
-            if not file_path.exists():
-                logger.warning(f"File does not exist: {file_path}")
+            # One stat() both checks existence and gets the metadata
+            stats = self._safe_stat(file_path)
+            if stats is None:
+                self._warn_inaccessible(file_path)
                 return self._get_default_file_info(file_path)
-                
-            stats = file_path.stat()
             
             # Basic file info
-            filename = file_path.stem
-            extension = file_path.suffix.lstrip('.')
+            source_dir, filename, extension = self._split_path(file_path)
             size_mb = round(stats.st_size / (1024 * 1024), 2)
             
             # Source directory info
-            source_dir = file_path.parent
-            source_dir_name = source_dir.name
+            source_dir_name = os.path.basename(source_dir)
             
             # Creation date
             try:
@@ -81,11 +183,9 @@ class FileManager:
             except Exception:
                 create_date_str = datetime.datetime.now().strftime('%Y-%m-%d')
             
-            # Current date/time
-            now = datetime.datetime.now()
-            date_str = now.strftime('%Y-%m-%d')
-            time_str = now.strftime('%H-%M-%S')
-            datetime_str = now.strftime('%Y-%m-%d_%H-%M-%S')
+            # Current date/time, formatted once and sliced
+            datetime_str = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+            date_str, time_str = datetime_str[:10], datetime_str[11:]
             
             return {
                 'filename': filename,
@@ -97,7 +197,7 @@ class FileManager:
                 'size': str(size_mb),
                 'counter': str(self.counter),
                 'source': source_dir_name,
-                'source_full': str(source_dir),
+                'source_full': source_dir,
                 # These will be populated later if video info is available
                 'resolution': '',
                 'codec': '',
@@ -105,18 +205,20 @@ class FileManager:
                 'quality': ''
             }
         except Exception as e:
-            logger.error(f"Error getting file info: {e}")
+            logger.error("Error getting file info: %s", e)
             return self._get_default_file_info(file_path)
     
-    def _get_default_file_info(self, file_path: Path) -> Dict:
+    def _get_default_file_info(self, file_path: str) -> Dict:
         """Get default file information when file cannot be accessed"""
+        _, filename, extension = self._split_path(file_path)
+        datetime_str = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         return {
-            'filename': file_path.stem,
-            'ext': file_path.suffix.lstrip('.'),
-            'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-            'time': datetime.datetime.now().strftime('%H-%M-%S'),
-            'datetime': datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S'),
-            'create_date': datetime.datetime.now().strftime('%Y-%m-%d'),
+            'filename': filename,
+            'ext': extension,
+            'date': datetime_str[:10],
+            'time': datetime_str[11:],
+            'datetime': datetime_str,
+            'create_date': datetime_str[:10],
             'size': '0',
             'counter': str(self.counter),
             'resolution': '',
@@ -140,35 +242,105 @@ class FileManager:
             Formatted filename string
         """
         try:
-            # Get basic file info
-            info = self.get_file_info(file_path)
+            parts, needed = _compile_template(template)
             
-            # Add video-specific info if available
-            if video_info:
-                if 'width' in video_info and 'height' in video_info:
-                    info['resolution'] = f"{video_info['width']}x{video_info['height']}"
-                if 'codec' in video_info:
-                    info['codec'] = video_info['codec']
-                if 'duration' in video_info:
-                    info['duration'] = str(round(video_info['duration'], 1))
+            # Every application uses up one counter value
+            counter = self._next_counter()
             
-            # Add quality info
-            info['quality'] = quality
+            # Literal template: no file lookups needed
+            if not needed:
+                return self.get_safe_filename(template)
             
-            # Apply template
-            result = template
-            for placeholder, value in info.items():
-                result = result.replace(f"{{{placeholder}}}", str(value))
+            info = self._get_template_values(needed, file_path, video_info, quality)
+            info['counter'] = str(counter)
             
-            # Increment counter for next use
-            self.counter += 1
+            # Apply the compiled template; unknown placeholders are left as written
+            values = list(parts)
+            for index in range(1, len(values), 2):
+                name = values[index]
+                values[index] = info.get(name, f"{{{name}}}")
+            result = ''.join(values)
             
             # Ensure filename is safe
             return self.get_safe_filename(result)
         except Exception as e:
-            logger.error(f"Error applying prefix template: {e}")
+            logger.error("Error applying prefix template: %s", e)
             # Fallback to safe filename
-            return self.get_safe_filename(Path(file_path).stem)
+            return self.get_safe_filename(self._split_path(file_path)[1])
+    
+    def _next_counter(self) -> int:
+        """Take the next {counter} value (safe to call from several threads)"""
+        with self._counter_lock:
+            value = self.counter
+            self.counter += 1
+            return value
+    
+    def reset_counter(self, start: int = 1):
+        """Restart the {counter} placeholder (call when a new batch starts)
+        
+        Args:
+            start: Value the next filename will get
+        """
+        with self._counter_lock:
+            self.counter = start
+    
+    def _get_template_values(self, needed: set, file_path: str,
+                             video_info: Optional[Dict], quality: str) -> Dict[str, str]:
+        """Compute values for the placeholders a template uses
+        
+        The stat() call and clock reads are skipped when the template does
+        not use any placeholder that needs them.
+        
+        Args:
+            needed: Placeholder names used in the template
+            file_path: Input file path
+            video_info: Optional video information dictionary
+            quality: Selected quality preset
+            
+        Returns:
+            Dictionary of placeholder names and their values
+        """
+        source_dir, filename, extension = self._split_path(file_path)
+        info = {
+            'filename': filename,
+            'ext': extension,
+            'source': os.path.basename(source_dir),
+            'source_full': source_dir,
+            'quality': quality,
+            'resolution': '',
+            'codec': '',
+            'duration': ''
+        }
+        
+        if needed & self.STAT_PLACEHOLDERS:
+            stats = self._safe_stat(file_path)
+            if stats is not None:
+                info['size'] = str(round(stats.st_size / (1024 * 1024), 2))
+                try:
+                    info['create_date'] = datetime.datetime.fromtimestamp(stats.st_ctime).strftime('%Y-%m-%d')
+                except (ValueError, OverflowError, OSError):
+                    info['create_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
+            else:
+                self._warn_inaccessible(file_path)
+                info['size'] = '0'
+                info['create_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
+        
+        if needed & {'date', 'time', 'datetime'}:
+            datetime_str = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+            info['date'] = datetime_str[:10]
+            info['time'] = datetime_str[11:]
+            info['datetime'] = datetime_str
+        
+        # Add video-specific info if available
+        if video_info:
+            if 'width' in video_info and 'height' in video_info:
+                info['resolution'] = f"{video_info['width']}x{video_info['height']}"
+            if 'codec' in video_info:
+                info['codec'] = str(video_info['codec'])
+            if 'duration' in video_info:
+                info['duration'] = str(round(video_info['duration'], 1))
+        
+        return info
     
     def generate_output_path(self, input_path: str, output_dir: str, 
                            prefix_template: str, output_format: str,
@@ -196,24 +368,52 @@ class FileManager:
             # Ensure output format has no leading dot
             output_format = output_format.lstrip('.')
             
-            # Combine with output directory and format
-            output_path = os.path.join(output_dir, f"{filename}.{output_format}")
-            
-            # Handle filename conflicts
+            # Handle filename conflicts against one directory snapshot: no
+            # syscall per candidate, however many names collide
+            reserved = self._get_reserved_names(output_dir)
+            base_name = filename
+            filename = f"{base_name}.{output_format}"
             counter = 1
-            base_path = output_path
-            while os.path.exists(output_path):
-                name, ext = os.path.splitext(base_path)
-                output_path = f"{name}_{counter}{ext}"
+            while os.path.normcase(filename) in reserved:
+                filename = f"{base_name}_{counter}.{output_format}"
                 counter += 1
             
-            return output_path
+            reserved.add(os.path.normcase(filename))
+            return os.path.join(output_dir, filename)
         except Exception as e:
-            logger.error(f"Error generating output path: {e}")
+            logger.error("Error generating output path: %s", e)
             # Fallback to basic output path
-            safe_name = self.get_safe_filename(Path(input_path).stem)
+            safe_name = self.get_safe_filename(self._split_path(input_path)[1])
             return os.path.join(output_dir, f"{safe_name}.{output_format.lstrip('.')}")
     
+    def _get_reserved_names(self, output_dir: str) -> set:
+        """Get the set of taken names (normcased) in an output directory, read once per directory"""
+        key = os.path.abspath(output_dir)
+        if key not in self._reserved_outputs:
+            try:
+                with os.scandir(output_dir) as entries:
+                    self._reserved_outputs[key] = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                # Directory does not exist yet: nothing in it can conflict
+                self._reserved_outputs[key] = set()
+        return self._reserved_outputs[key]
+    
+    def release_output_path(self, output_path: str):
+        """Make a path from generate_output_path available again (e.g. after a failed encode)
+        
+        Args:
+            output_path: Path returned by generate_output_path
+        """
+        directory, filename = os.path.split(output_path)
+        if not os.path.exists(output_path):
+            reserved = self._reserved_outputs.get(os.path.abspath(directory or os.curdir), set())
+            reserved.discard(os.path.normcase(filename))
+    
+    def clear_reserved_outputs(self):
+        """Forget directory snapshots, handed-out paths and prefetched stats (call when a new batch starts)"""
+        self._reserved_outputs.clear()
+        self._stat_cache.clear()
+    
     def ensure_directory_exists(self, directory: str) -> bool:
         """Ensure the specified directory exists, create if necessary
         
@@ -227,7 +427,7 @@ class FileManager:
             os.makedirs(directory, exist_ok=True)
             return True
         except Exception as e:
-            logger.error(f"Error creating directory {directory}: {e}")
+            logger.error("Error creating directory %s: %s", directory, e)
             return False
     
     def is_path_writable(self, path: str) -> bool:
@@ -239,23 +439,125 @@ class FileManager:
         Returns:
             True if writable, False otherwise
         """
-        if os.path.isdir(path):
-            # Check if directory is writable
-            try:
-                test_file = os.path.join(path, '.write_test')
-                with open(test_file, 'w') as f:
-                    f.write('test')
-                os.remove(test_file)
-                return True
-            except Exception:
+        # Walk up to the first existing directory; it decides whether the rest can be created
+        while not os.path.isdir(path):
+            parent = os.path.dirname(path) or os.curdir
+            if parent == path:
                 return False
-        else:
-            # Check if parent directory is writable
-            return self.is_path_writable(os.path.dirname(path))
+            path = parent
+        
+        directory = os.path.realpath(path)
+        if directory not in self._writable_cache:
+            # Cheap permission check first; only do the write test when it says no,
+            # since some network filesystems report permissions unreliably
+            self._writable_cache[directory] = (
+                os.access(directory, os.W_OK | os.X_OK) or self._write_test(directory)
+            )
+        return self._writable_cache[directory]
+    
+    def _write_test(self, directory: str) -> bool:
+        """Check writability by creating and removing a test file"""
+        try:
+            test_file = os.path.join(directory, '.write_test')
+            with open(test_file, 'w') as f:
+                f.write('test')
+            os.remove(test_file)
+            return True
+        except Exception:
+            return False
+    
+    def _scan_entries(self, directory: str, is_supported) -> Tuple[List[str], List[str]]:
+        """Read one directory with a single scandir
+        
+        Args:
+            directory: Directory to read
+            is_supported: Predicate on file names
+            
+        Returns:
+            Tuple of (supported file paths, subdirectory paths), both sorted by name
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):  # Sort alphabetically
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif is_supported(entry.name) and entry.is_file():
+                        files.append(entry.path)
+        except OSError as e:
+            logger.warning("Cannot read directory %s: %s", directory, e)
+        return files, subdirs
     
     def get_available_placeholders(self) -> Dict[str, str]:
         """Get dictionary of available placeholders and their descriptions"""
         return self.PREFIX_PLACEHOLDERS.copy()
+    
+    def scan_directory(self, directory_path: str, recursive: bool = False) -> List[str]:
+        """Scan a directory for supported video files
+        
+        Args:
+            directory_path: Directory to scan
+            recursive: Whether to scan subdirectories
+            
+        Returns:
+            List of file paths (sorted alphabetically)
+        """
+        try:
+            if not os.path.isdir(directory_path):
+                logger.error("Not a valid directory: %s", directory_path)
+                return []
+            
+            return sorted(self.iter_directory(directory_path, recursive))
+        except Exception as e:
+            logger.error("Error scanning directory: %s", e, exc_info=True)
+            return []
+    
+    def iter_directory(self, directory_path: str, recursive: bool = False) -> Iterator[str]:
+        """Yield supported video files as they are found
+        
+        Files come out in sorted walk order: each directory's files by name,
+        then its subdirectories depth-first by name. The order is the same on
+        every scan of a tree, and callers can start working before a large
+        tree is fully read.
+        
+        Args:
+            directory_path: Directory to scan
+            recursive: Whether to scan subdirectories
+            
+        Yields:
+            Supported file paths
+        """
+        # Supported extensions are a class attribute; no encoder (and no
+        # ffmpeg hardware probing) is needed. Imported here because the
+        # encoder module imports this one.
+        from .encoder import VideoEncoder
+        # A tuple lets str.endswith test every extension in one C call
+        extensions = tuple(VideoEncoder.SUPPORTED_FORMATS)
+        
+        def is_supported(name):
+            return name.lower().endswith(extensions)
+        
+        # scandir entries carry the file type from readdir, so no stat() per file
+        files, subdirs = self._scan_entries(directory_path, is_supported)
+        yield from files
+        if not recursive or not subdirs:
+            return
+        
+        # Read subdirectories in parallel; readdir releases the GIL, which
+        # hides per-directory latency on slow disks and network shares.
+        # Reads run ahead of the output, but results are taken from a stack in
+        # walk order, so completion order never changes what comes out when.
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            stack = []
+            while True:
+                futures = [executor.submit(self._scan_entries, subdir, is_supported)
+                           for subdir in subdirs]
+                stack.extend(reversed(futures))
+                if not stack:
+                    break
+                files, subdirs = stack.pop().result()
+                yield from files
 
 
 # Singleton instance
@@ -268,44 +570,3 @@ def get_file_manager() -> FileManager:
     if _file_manager_instance is None:
         _file_manager_instance = FileManager()
     return _file_manager_instance
-
-
-def scan_directory(self, directory_path: str, recursive: bool = False) -> List[str]:
-    """Scan a directory for supported video files
-    
-    Args:
-        directory_path: Directory to scan
-        recursive: Whether to scan subdirectories
-        
-    Returns:
-        List of file paths (sorted alphabetically)
-    """
-    try:
-        if not os.path.isdir(directory_path):
-            logger.error(f"Not a valid directory: {directory_path}")
-            return []
-            
-        supported_files = []
-        
-        # Get supported extensions from VideoEncoder
-        from .encoder import VideoEncoder
-        encoder = VideoEncoder()
-        
-        if recursive:
-            # Walk through all subdirectories
-            for root, _, files in os.walk(directory_path):
-                for file in sorted(files):  # Sort files alphabetically
-                    file_path = os.path.join(root, file)
-                    if encoder.is_supported_format(file_path):
-                        supported_files.append(file_path)
-        else:
-            # Just scan the top directory
-            for file in sorted(os.listdir(directory_path)):  # Sort files alphabetically
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path) and encoder.is_supported_format(file_path):
-                    supported_files.append(file_path)
-        
-        return supported_files
-    except Exception as e:
-        logger.error(f"Error scanning directory: {e}", exc_info=True)
-        return []
\ No newline at end of file
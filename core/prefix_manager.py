@@ -15,6 +15,9 @@ from .file_manager import get_file_manager
 
 logger = logging.getLogger('video_encoder.core.prefix_manager')
 
+# Characters not allowed in templates (they would end up in filenames)
+_INVALID_CHARS_RE = re.compile(r'[\\/*?:"<>|]')
+
 
 class PrefixManager:
     """Manages prefix templates and their application for output filenames"""
@@ -36,6 +39,8 @@ class PrefixManager:
         """Initialize the prefix manager"""
         self.file_manager = get_file_manager()
         self.custom_templates = {}
+        self._templates_cache = None  # Merged default + custom templates, rebuilt after changes
+        self._validation_cache = {}  # Template string -> validation result
         self.load_custom_templates()
     
     def load_custom_templates(self):
@@ -61,6 +66,7 @@ class PrefixManager:
             
             # Save template
             self.custom_templates[name] = template
+            self._templates_cache = None
             # This would save to settings in a real implementation
             return True
         except Exception as e:
@@ -79,6 +85,7 @@ class PrefixManager:
         try:
             if name in self.custom_templates:
                 del self.custom_templates[name]
+                self._templates_cache = None
                 # This would save to settings in a real implementation
                 return True
             return False
@@ -90,13 +97,15 @@ class PrefixManager:
         """Get all available templates (default + custom)
         
         Returns:
-            Dictionary of template names and their format strings
+            Dictionary of template names and their format strings (shared; do not modify)
         """
-        # Combine default and custom templates
-        all_templates = {}
-        all_templates.update(self.DEFAULT_TEMPLATES)
-        all_templates.update(self.custom_templates)
-        return all_templates
+        if self._templates_cache is None:
+            # Combine default and custom templates
+            all_templates = {}
+            all_templates.update(self.DEFAULT_TEMPLATES)
+            all_templates.update(self.custom_templates)
+            self._templates_cache = all_templates
+        return self._templates_cache
     
     def validate_template(self, template: str) -> bool:
         """Validate a template string
@@ -107,25 +116,31 @@ class PrefixManager:
         Returns:
             True if valid, False otherwise
         """
+        # Previews validate the same strings repeatedly
+        if template in self._validation_cache:
+            return self._validation_cache[template]
+        if len(self._validation_cache) >= 256:
+            self._validation_cache.clear()
+        
+        result = self._validate_template(template)
+        self._validation_cache[template] = result
+        return result
+    
+    def _validate_template(self, template: str) -> bool:
+        """Uncached template validation for validate_template"""
         try:
             # Check if template is empty
             if not template or not template.strip():
                 return False
             
             # Check for invalid characters in template
-            if re.search(r'[\\/*?:"<>|]', template):
+            if _INVALID_CHARS_RE.search(template):
                 return False
             
             # Check for valid placeholders
-            placeholders = re.findall(r'\{([^\}]+)\}', template)
-            valid_placeholders = self.file_manager.get_available_placeholders().keys()
-            valid_placeholders = [p.strip('{}') for p in valid_placeholders]
-            
-            for placeholder in placeholders:
-                if placeholder not in valid_placeholders:
-                    return False
-            
-            return True
+            valid_placeholders = self.file_manager.VALID_PLACEHOLDERS
+            return all(placeholder in valid_placeholders
+                       for placeholder in self.file_manager.get_template_placeholders(template))
         except Exception as e:
             logger.error(f"Error validating template: {e}")
             return False
@@ -8,7 +8,9 @@ Implements the main application window for the video encoder
 
 import os
 import sys
+import time
 import logging
+from collections import deque
 from pathlib import Path
 from typing import List, Dict, Optional
 
@@ -20,7 +22,9 @@ from PyQt5.QtWidgets import (
     QCheckBox, QSpinBox, QDoubleSpinBox, QLineEdit, QGroupBox,
     QFormLayout, QSizePolicy, QApplication, QActionGroup
 )
-from PyQt5.QtCore import Qt, QSize, QUrl, QThread, pyqtSignal, QMimeData, QSettings
+from PyQt5.QtCore import (
+    Qt, QSize, QUrl, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot, QMimeData, QSettings
+)
 from PyQt5.QtGui import QIcon, QPixmap, QDrag, QKeySequence, QDragEnterEvent, QDropEvent
 
 from config.settings import Settings
@@ -33,70 +37,178 @@ from ui.widgets.settings_dialog import SettingsDialog
 
 logger = logging.getLogger('video_encoder.ui.main_window')
 
+# Input extensions the encoder accepts, and the matching file dialog filter
+_SUPPORTED_EXTS = VideoEncoder.SUPPORTED_FORMATS
+_VIDEO_FILE_FILTER = (
+    "Video Files (" + " ".join(f"*{ext}" for ext in sorted(_SUPPORTED_EXTS)) + ");;All Files (*.*)"
+)
+
+
+class EncodeJobSignals(QObject):
+    """Signals emitted by an EncodeJob (QRunnable is not a QObject)"""
+    progress_update = pyqtSignal(int, int, str)  # Row, percent, message
+    encoding_finished = pyqtSignal(int, bool, str)  # Row, success, message
+
 
-class EncoderThread(QThread):
-    """Thread for running encoding operations without blocking the UI"""
-    progress_update = pyqtSignal(int, str)
-    encoding_finished = pyqtSignal(bool, str)
+class EncodeJob(QRunnable):
+    """One file's encoding, run on a thread pool without blocking the UI"""
     
-    def __init__(self, encoder: VideoEncoder, input_path: str, output_path: str, 
+    def __init__(self, encoder: VideoEncoder, row: int, input_path: str, output_path: str, 
                  quality: str, target_size: Optional[int] = None,
-                 output_format: Optional[str] = None):
+                 output_format: Optional[str] = None,
+                 threads: Optional[int] = None,
+                 video_info: Optional[Dict] = None):
         super().__init__()
+        # The window keeps each job until it finishes, so Qt must not delete it
+        self.setAutoDelete(False)
+        self.signals = EncodeJobSignals()
         self.encoder = encoder
+        self.row = row
         self.input_path = input_path
         self.output_path = output_path
         self.quality = quality
         self.target_size = target_size
         self.output_format = output_format
+        self.threads = threads
+        self.video_info = video_info
         self.cancelled = False
+        self.last_emit_time = 0.0  # time.monotonic() of the last progress signal
     
     def run(self):
         """Run the encoding process"""
         try:
-            # This is a simplified version - in a real app, you would
-            # hook into ffmpeg progress updates
-            self.progress_update.emit(0, "Starting encoding...")
-            
-            # Simulate progress updates
-            for i in range(1, 101):
-                if self.cancelled:
-                    self.encoding_finished.emit(False, "Encoding cancelled")
-                    return
-                
-                # In a real app, this would be actual progress from ffmpeg
-                self.progress_update.emit(i, f"Encoding: {i}%")
-                self.msleep(50)  # Simulate work
+            if self.cancelled:
+                self.signals.encoding_finished.emit(self.row, False, "Encoding cancelled")
+                return
+            
+            self.signals.progress_update.emit(self.row, 0, "Starting encoding...")
             
-            # Perform the actual encoding
+            # Perform the actual encoding, reporting ffmpeg's own progress
             success, message = self.encoder.convert_video(
                 self.input_path, 
                 self.output_path,
                 self.quality,
                 self.target_size,
-                self.output_format
+                self.output_format,
+                threads=self.threads,
+                video_info=self.video_info,
+                progress_callback=self._report_progress
             )
             
-            self.encoding_finished.emit(success, message)
+            if self.cancelled:
+                self.signals.encoding_finished.emit(self.row, False, "Encoding cancelled")
+                return
+            
+            self.signals.encoding_finished.emit(self.row, success, message)
         except Exception as e:
-            logger.error(f"Error in encoder thread: {e}")
-            self.encoding_finished.emit(False, str(e))
+            logger.error(f"Error in encode job: {e}")
+            self.signals.encoding_finished.emit(self.row, False, str(e))
+    
+    def _report_progress(self, percent: int) -> Optional[bool]:
+        """Forward encoder progress to the UI (runs on the pool thread)
+        
+        Returns:
+            False to stop ffmpeg once the encoding has been cancelled
+        """
+        if self.cancelled:
+            return False
+        
+        # At most 10 updates a second; the final 100% always goes through
+        now = time.monotonic()
+        if now - self.last_emit_time < 0.1 and percent < 100:
+            return None
+        self.last_emit_time = now
+        self.signals.progress_update.emit(self.row, percent, f"Encoding: {percent}%")
+        return None
     
     def cancel(self):
-        """Cancel the encoding process"""
+        """Cancel the encoding process (a job still queued finishes without encoding)"""
         self.cancelled = True
 
 
+class ScanJobSignals(QObject):
+    """Signals emitted by a ScanJob"""
+    batch = pyqtSignal(list)  # Next file paths found, in scan order
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)  # Error message
+
+
+class ScanJob(QRunnable):
+    """Directory scan run on a thread pool, so large trees don't freeze the UI"""
+    
+    # Most file paths delivered per batch signal
+    BATCH_SIZE = 512
+    
+    def __init__(self, file_manager: FileManager, directory: str, recursive: bool):
+        super().__init__()
+        # The window keeps the job until it reports back, so Qt must not delete it
+        self.setAutoDelete(False)
+        self.signals = ScanJobSignals()
+        self.file_manager = file_manager
+        self.directory = directory
+        self.recursive = recursive
+    
+    def run(self):
+        """Scan the directory, emitting files in batches as they are found
+        
+        iter_directory yields files in sorted walk order, so the list comes
+        out the same on every scan without a sort over the whole tree.
+        """
+        try:
+            files = []
+            for file_path in self.file_manager.iter_directory(self.directory, self.recursive):
+                files.append(file_path)
+                if len(files) >= self.BATCH_SIZE:
+                    self.signals.batch.emit(files)
+                    files = []
+            if files:
+                self.signals.batch.emit(files)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"Error scanning directory: {e}", exc_info=True)
+            self.signals.failed.emit(str(e))
+
+
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Delay after startup before the settings dialog is built in the background
+    SETTINGS_PRELOAD_MS = 2000
+    
     def __init__(self, settings: Settings):
         super().__init__()
         self.settings = settings
         self.encoder = VideoEncoder()
         self.file_manager = FileManager()
         self.prefix_manager = PrefixManager()
-        self.encoder_thread = None
+        
+        # Encoding runs on a pool sized like VideoEncoder.batch_convert: several
+        # ffmpeg processes at once, each limited to its share of the physical cores
+        self.encode_pool = QThreadPool(self)
+        self.encode_workers = max(1, self.encoder.physical_cores // 4)
+        self.encode_pool.setMaxThreadCount(self.encode_workers)
+        self.pending = deque()  # (row, input path) of files not yet given a job
+        self.batch_settings = None  # Encoding settings of the running batch
+        self.batch_running = False
+        self.jobs = {}  # Row -> EncodeJob still queued or running
+        self.job_progress = {}  # Row -> percent done of a running job
+        self.batch_size = 0
+        self.completed_count = 0
+        self.failed_count = 0
+        self.batch_cancelled = False
+        self.dispatching = False  # True while a job is being created (possibly behind a prompt)
+        self.scan_job = None  # Directory scan in progress, if any
+        self.scan_added = 0  # Files the running scan has added to the list
+        
+        # Finished rows are colored in batches instead of one repaint per file
+        self.row_results = {}  # Row -> success, waiting to be colored
+        self.row_color_timer = QTimer(self)
+        self.row_color_timer.setSingleShot(True)
+        self.row_color_timer.setInterval(200)
+        self.row_color_timer.timeout.connect(self.flush_row_colors)
+        
+        self.applied_stylesheet = None  # Stylesheet currently set on the window
+        self.settings_dialog = None  # Created once the window is idle (or on first use) and reused
         
         # Initialize UI
         self.init_ui()
@@ -109,6 +221,9 @@ class MainWindow(QMainWindow):
         
         # Setup drag and drop
         self.setAcceptDrops(True)
+        
+        # Build the settings dialog after startup, so opening it later is instant
+        QTimer.singleShot(self.SETTINGS_PRELOAD_MS, self.preload_settings_dialog)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -236,8 +351,16 @@ class MainWindow(QMainWindow):
             
             clear_recent_action = QAction("Clear Recent Files", self)
             clear_recent_action.triggered.connect(self.clear_recent_files)
-            self.recent_menu.addAction(clear_recent_action)
-            self.recent_menu.addSeparator()
+            # Owned by the window, so QMenu.clear() leaves them alive for re-adding
+            recent_separator = QAction(self)
+            recent_separator.setSeparator(True)
+            self.recent_persistent_actions = [clear_recent_action, recent_separator]
+            self.recent_menu.addActions(self.recent_persistent_actions)
+            
+            # File entries are only built when the menu is opened
+            self.recent_actions = []  # File entries, in menu order
+            self.recent_menu_dirty = True
+            self.recent_menu.aboutToShow.connect(self.rebuild_recent_files_menu)
             
             # Exit action
             exit_action = QAction("E&xit", self)
@@ -275,7 +398,8 @@ class MainWindow(QMainWindow):
                 theme_action = QAction(theme.capitalize(), self, checkable=True)
                 if theme == self.settings.get('theme', 'system'):
                     theme_action.setChecked(True)
-                theme_action.triggered.connect(lambda checked, t=theme: self.change_theme(t))
+                theme_action.setData(theme)
+                theme_action.triggered.connect(self.on_theme_triggered)
                 theme_group.addAction(theme_action)
                 theme_menu.addAction(theme_action)
             
@@ -288,7 +412,8 @@ class MainWindow(QMainWindow):
                 language_action = QAction(name, self, checkable=True)
                 if code == self.settings.get('language', 'en'):
                     language_action.setChecked(True)
-                language_action.triggered.connect(lambda checked, c=code: self.change_language(c))
+                language_action.setData(code)
+                language_action.triggered.connect(self.on_language_triggered)
                 language_group.addAction(language_action)
                 language_menu.addAction(language_action)
             
@@ -309,28 +434,56 @@ class MainWindow(QMainWindow):
     def apply_theme(self):
         """Apply the current theme stylesheet"""
         stylesheet = self.settings.get_theme_stylesheet()
-        self.setStyleSheet(stylesheet)
+        # Re-setting an identical stylesheet still re-polishes every widget
+        if stylesheet == self.applied_stylesheet:
+            return
+        self.applied_stylesheet = stylesheet
+        
+        # Repaint once after every child has been re-polished, not in between
+        self.setUpdatesEnabled(False)
+        try:
+            self.setStyleSheet(stylesheet)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
+    @pyqtSlot()
+    def on_theme_triggered(self):
+        """Shared slot for the theme actions (theme name in QAction.data)"""
+        self.change_theme(self.sender().data())
+    
+    @pyqtSlot()
+    def on_language_triggered(self):
+        """Shared slot for the language actions (language code in QAction.data)"""
+        self.change_language(self.sender().data())
     
     def change_theme(self, theme: str):
         """Change the application theme"""
         self.settings.set('theme', theme)
-        self.settings.save_settings()
         self.apply_theme()
     
     def change_language(self, language_code: str):
         """Change the application language"""
         self.settings.set('language', language_code)
-        self.settings.save_settings()
         QMessageBox.information(
             self, 
             "Language Changed", 
             "Please restart the application for the language change to take effect."
         )
     
+    def preload_settings_dialog(self):
+        """Create the settings dialog ahead of the first Settings click"""
+        if self.settings_dialog is None:
+            self.settings_dialog = SettingsDialog(self.settings, self)
+    
     def show_settings(self):
         """Show the settings dialog"""
-        dialog = SettingsDialog(self.settings, self)
-        if dialog.exec_():
+        if self.settings_dialog is None:
+            self.settings_dialog = SettingsDialog(self.settings, self)
+        else:
+            self.settings_dialog.refresh()
+        
+        if self.settings_dialog.exec_():
             # Apply changes if dialog was accepted
             self.apply_theme()
     
@@ -359,7 +512,7 @@ class MainWindow(QMainWindow):
             self,
             "Select Video Files",
             start_dir,
-            "Video Files (*.mp4 *.avi *.mkv *.mov *.wmv *.flv *.webm);;All Files (*.*)"
+            _VIDEO_FILE_FILTER
         )
         
         if files:
@@ -370,31 +523,36 @@ class MainWindow(QMainWindow):
             # Add files to list
             self.add_files_to_list(files)
     
-    def add_files_to_list(self, file_paths: List[str]):
-        """Add files to the list widget"""
+    def add_files_to_list(self, file_paths: List[str], known_files: bool = False):
+        """Add files to the list widget
+        
+        Args:
+            file_paths: Paths to add
+            known_files: True if the paths were already checked to be files
+        """
         try:
             # Check if any files were provided
             if not file_paths:
                 return
             
             # Filter for supported files
-            supported_files = []
-            for file_path in file_paths:
-                if self.encoder.is_supported_format(file_path):
-                    supported_files.append(file_path)
+            supported_files = [file_path for file_path in file_paths
+                               if os.path.splitext(file_path)[1].lower() in _SUPPORTED_EXTS]
             
             # Add files to list
-            count = self.file_list.add_files(supported_files)
+            count = self.file_list.add_files(supported_files, known_files)
             
             # Update status
             if count > 0:
                 self.statusBar.showMessage(f"Added {count} files")
                 
+                # Probe while the user picks settings, so starting the batch finds the info cached
+                self.encoder.prefetch_video_info(supported_files)
+                
                 # Save last directory to settings
                 if self.settings.get('remember_last_directory', True) and count > 0:
                     last_dir = os.path.dirname(file_paths[0])
                     self.settings.set('last_directory', last_dir)
-                    self.settings.save_settings()
                     
                 # Add to recent files
                 for file_path in supported_files:
@@ -416,24 +574,114 @@ class MainWindow(QMainWindow):
         """Clear all files from the list"""
         self.file_list.clear()
     
+    def add_directory(self):
+        """Add all supported files from a directory (scanned in the background)"""
+        try:
+            # A scan is already running; its results will arrive shortly
+            if self.scan_job is not None:
+                return
+            
+            # Get directory from encoding form
+            directory, recursive = self.encoding_form.get_input_options()
+            
+            if not directory or not os.path.isdir(directory):
+                QMessageBox.warning(self, "Invalid Directory", "Please select a valid directory first")
+                return
+            
+            # Show loading indicator
+            self.statusBar.showMessage("Scanning directory...")
+            
+            # Results replace the list, streamed in as they are found
+            self.clear_files()
+            self.scan_added = 0
+            self.scan_job = ScanJob(self.file_manager, directory, recursive)
+            self.scan_job.signals.batch.connect(self.on_scan_batch, Qt.QueuedConnection)
+            self.scan_job.signals.finished.connect(self.on_scan_finished, Qt.QueuedConnection)
+            self.scan_job.signals.failed.connect(self.on_scan_failed, Qt.QueuedConnection)
+            QThreadPool.globalInstance().start(self.scan_job)
+        except Exception as e:
+            logger.error(f"Error adding directory: {e}", exc_info=True)
+            self.statusBar.showMessage(f"Error scanning directory: {str(e)}")
+    
+    @pyqtSlot(list)
+    def on_scan_batch(self, files: List[str]):
+        """Add the next batch of scanned files to the list"""
+        try:
+            # The scan read each entry's type from the directory, so skip the stat
+            count = self.file_list.add_files(files, known_files=True)
+            if count > 0:
+                self.scan_added += count
+                self.encoder.prefetch_video_info(files)
+            self.statusBar.showMessage(f"Scanning directory... {self.scan_added} files added")
+        except Exception as e:
+            logger.error(f"Error adding directory: {e}", exc_info=True)
+            self.statusBar.showMessage(f"Error scanning directory: {str(e)}")
+    
+    @pyqtSlot()
+    def on_scan_finished(self):
+        """Report the completed directory scan"""
+        self.scan_job = None
+        
+        # Update status with count
+        count = self.scan_added
+        if count > 0:
+            self.statusBar.showMessage(f"Added {count} files from directory")
+            self.status_label.setText(f"Ready - {count} files loaded")
+        else:
+            self.statusBar.showMessage("No supported files found in directory")
+            self.status_label.setText("No supported files found")
+    
+    @pyqtSlot(str)
+    def on_scan_failed(self, message: str):
+        """Report a directory scan that raised"""
+        self.scan_job = None
+        self.statusBar.showMessage(f"Error scanning directory: {message}")
+    
     def load_recent_files(self):
         """Load recent files from settings"""
         self.update_recent_files_menu()
     
     def update_recent_files_menu(self):
-        """Update the recent files menu"""
-        # Clear existing items (except the clear action and separator)
-        for action in self.recent_menu.actions()[2:]:
-            self.recent_menu.removeAction(action)
-        
-        # Add recent files
-        recent_files = self.settings.get_recent_files()
-        if recent_files:
-            for file_path in recent_files:
-                action = QAction(os.path.basename(file_path), self)
-                action.setStatusTip(file_path)
-                action.triggered.connect(lambda checked, path=file_path: self.open_recent_file(path))
-                self.recent_menu.addAction(action)
+        """Mark the recent files menu for rebuilding the next time it is shown"""
+        self.recent_menu_dirty = True
+    
+    def rebuild_recent_files_menu(self):
+        """Bring the recent files entries up to date (connected to aboutToShow)"""
+        if not self.recent_menu_dirty:
+            return
+        self.recent_menu_dirty = False
+        
+        recent_files = self.settings.get_recent_files() or []
+        actions = self.recent_actions
+        
+        # Relabel the existing entries in place
+        for action, file_path in zip(actions, recent_files):
+            action.setText(os.path.basename(file_path))
+            action.setStatusTip(file_path)
+            action.setData(file_path)
+        
+        # Drop surplus entries: clear the menu in one pass and re-add what stays
+        if len(actions) > len(recent_files):
+            for action in actions[len(recent_files):]:
+                action.deleteLater()
+            del actions[len(recent_files):]
+            self.recent_menu.clear()
+            self.recent_menu.addActions(self.recent_persistent_actions)
+            self.recent_menu.addActions(actions)
+        
+        # Add missing entries
+        for file_path in recent_files[len(actions):]:
+            action = QAction(os.path.basename(file_path), self)
+            action.setStatusTip(file_path)
+            action.setData(file_path)
+            action.triggered.connect(self.on_recent_triggered)
+            actions.append(action)
+            self.recent_menu.addAction(action)
+    
+    @pyqtSlot()
+    def on_recent_triggered(self):
+        """Shared slot for the recent file actions (path read from QAction.data when triggered)"""
+        self.open_recent_file(self.sender().data())
     
     def open_recent_file(self, file_path: str):
         """Open a file from the recent files list"""
@@ -446,17 +694,12 @@ class MainWindow(QMainWindow):
                 f"The file {file_path} no longer exists."
             )
             # Remove from recent files
-            recent_files = self.settings.get_recent_files()
-            if file_path in recent_files:
-                recent_files.remove(file_path)
-                self.settings.set('recent_files', recent_files)
-                self.settings.save_settings()
+            if self.settings.remove_recent_file(file_path):
                 self.update_recent_files_menu()
     
     def clear_recent_files(self):
         """Clear the recent files list"""
         self.settings.clear_recent_files()
-        self.settings.save_settings()
         self.update_recent_files_menu()
     
     def start_encoding(self):
@@ -482,73 +725,132 @@ class MainWindow(QMainWindow):
                     QMessageBox.critical(self, "Error", f"Could not create output directory: {e}")
                     return
             
-            # Disable start button and enable stop button
-            self.start_button.setEnabled(False)
-            self.stop_button.setEnabled(True)
+            # Disable controls while the batch runs
+            self.set_ui_enabled(False)
+            
+            # New batch: re-read output directories for name conflicts and restart {counter}
+            self.file_manager.clear_reserved_outputs()
+            self.file_manager.reset_counter()
+            
+            # Read input metadata ahead of the encoder when output names use it
+            input_paths = list(self.file_list.paths)
+            if self.file_manager.template_needs_stat(prefix_template):
+                self.file_manager.prefetch(input_paths)
             
             # Reset progress
             self.progress_bar.setValue(0)
             self.status_label.setText("Starting encoding...")
             
-            # Get current file
-            if self.file_list.count() > 0:
-                current_item = self.file_list.item(self.file_list.current_index)
-                if current_item:
-                    input_path = current_item.data(Qt.UserRole)
-                    
-                    # Generate output filename
-                    try:
-                        # Get video info for template
-                        video_info = self.encoder.get_video_info(input_path)
-                        
-                        # Generate output path
-                        output_path = self.file_manager.generate_output_path(
-                            input_path, output_dir, prefix_template, output_format, video_info, quality
-                        )
-                    except Exception as e:
-                        logger.error(f"Error generating output path: {e}")
-                        # Fallback to basic output path
-                        filename = os.path.basename(input_path)
-                        name, _ = os.path.splitext(filename)
-                        output_path = os.path.join(output_dir, f"{name}.{output_format}")
-                    
-                    # Start encoding thread
-                    self.encoder_thread = EncoderThread(
-                        self.encoder, input_path, output_path, quality, target_size, output_format
-                    )
-                    self.encoder_thread.progress_update.connect(self.update_progress)
-                    self.encoder_thread.encoding_finished.connect(self.file_encoding_finished)
-                    self.encoder_thread.start()
+            # Files are named and queued one per event loop pass, so probing
+            # and overwrite prompts never hold up the UI for the whole batch
+            self.pending = deque(enumerate(input_paths))
+            self.batch_settings = (quality, output_format, target_size, output_dir, prefix_template)
+            self.batch_running = True
+            self.jobs = {}
+            self.job_progress = {}
+            self.batch_size = len(input_paths)
+            self.completed_count = 0
+            self.failed_count = 0
+            self.batch_cancelled = False
+            
+            self.statusBar.showMessage(f"Encoding {self.batch_size} files")
+            QTimer.singleShot(0, self.dispatch_next)
         except Exception as e:
             logger.error(f"Error starting encoding: {e}", exc_info=True)
             QMessageBox.critical(self, "Error", f"Error starting encoding: {str(e)}")
-            self.start_button.setEnabled(True)
-            self.stop_button.setEnabled(False)
+            self.set_ui_enabled(True)
     
-    def process_next_file(self, quality: str, output_format: str, target_size: Optional[int],
-                         output_dir: str, prefix_template: str):
-        """Process the next file in the queue"""
-        # Check if there are files left to process
-        if self.file_list.current_index >= self.file_list.count():
-            # All files processed
-            self.encoding_finished(True, "All files processed successfully")
+    def dispatch_next(self):
+        """Create and start the job for the next pending file, then yield to the event loop"""
+        if self.batch_cancelled:
+            self.pending.clear()
+        if not self.pending:
+            self.check_batch_finished()
             return
         
-        # Get the next file
-        input_path = self.file_list.item(self.file_list.current_index).data(Qt.UserRole)
+        row, input_path = self.pending.popleft()
+        # The overwrite prompt runs a nested event loop: jobs finishing meanwhile
+        # must not see an empty queue and end the batch under it
+        self.dispatching = True
+        try:
+            job = self.create_encode_job(row, input_path, *self.batch_settings)
+        except Exception as e:
+            logger.error(f"Error queueing {input_path}: {e}", exc_info=True)
+            job = None
+            self.failed_count += 1
+            self.completed_count += 1
+            self.mark_row_finished(row, False)
+        else:
+            if job is not None and self.batch_cancelled:
+                # Stopped while the prompt was open
+                self.file_manager.release_output_path(job.output_path)
+                job = None
+            if job is None:
+                # Skipped: the batch is one file smaller
+                self.batch_size -= 1
+        finally:
+            self.dispatching = False
+        
+        if job is not None:
+            self.jobs[row] = job
+            # Jobs emit from pool threads; queue the calls onto the GUI thread explicitly
+            job.signals.progress_update.connect(self.update_progress, Qt.QueuedConnection)
+            job.signals.encoding_finished.connect(self.file_encoding_finished, Qt.QueuedConnection)
+            self.encode_pool.start(job)
+        
+        QTimer.singleShot(0, self.dispatch_next)
+    
+    def mark_row_finished(self, row: int, success: bool):
+        """Queue a finished file's row to be colored green or red"""
+        self.row_results[row] = success
+        if not self.row_color_timer.isActive():
+            self.row_color_timer.start()
+    
+    def flush_row_colors(self):
+        """Color every queued row with a single repaint of the list"""
+        self.row_color_timer.stop()
+        if not self.row_results:
+            return
         
-        # Get video info for prefix template
-        video_info = self.encoder.get_video_info(input_path)
+        self.file_list.mark_results(self.row_results)
+        self.row_results = {}
+    
+    def check_batch_finished(self):
+        """Finish the batch once no file is pending and every job has reported back"""
+        if not self.batch_running or self.dispatching or self.jobs or self.pending:
+            return
         
-        # Generate output path
-        output_path = self.file_manager.generate_output_path(
-            input_path,
-            output_dir,
-            prefix_template,
-            output_format,
-            video_info,
-            quality
-        )
+        if self.batch_cancelled:
+            self.encoding_finished(False, "Encoding cancelled")
+        elif self.failed_count:
+            self.encoding_finished(True, f"All files processed ({self.failed_count} failed)")
+        else:
+            self.encoding_finished(True, "All files processed")
+    
+    def create_encode_job(self, row: int, input_path: str, quality: str, output_format: str,
+                          target_size: Optional[int], output_dir: str,
+                          prefix_template: str) -> Optional[EncodeJob]:
+        """Create the encode job for one queued file
+        
+        Returns:
+            EncodeJob, or None if the user chose not to overwrite an existing output
+        """
+        # Generate output filename
+        video_info = None
+        try:
+            # Get video info for template
+            video_info = self.encoder.get_video_info(input_path)
+            
+            # Generate output path
+            output_path = self.file_manager.generate_output_path(
+                input_path, output_dir, prefix_template, output_format, video_info, quality
+            )
+        except Exception as e:
+            logger.error(f"Error generating output path: {e}")
+            # Fallback to basic output path
+            filename = os.path.basename(input_path)
+            name, _ = os.path.splitext(filename)
+            output_path = os.path.join(output_dir, f"{name}.{output_format}")
         
         # Check if output file already exists
         if os.path.exists(output_path) and self.settings.get('confirm_overwrite', True):
@@ -562,98 +864,74 @@ class MainWindow(QMainWindow):
             
             if reply == QMessageBox.No:
                 # Skip this file
-                self.file_list.current_index += 1
-                self.process_next_file(quality, output_format, target_size, output_dir, prefix_template)
-                return
+                self.file_manager.release_output_path(output_path)
+                return None
             elif reply == QMessageBox.YesToAll:
                 # Don't ask again for this session
                 self.settings.set('confirm_overwrite', False)
         
-        # Update status
-        self.status_label.setText(f"Encoding: {os.path.basename(input_path)}")
-        self.statusBar.showMessage(f"Encoding file {self.file_list.current_index + 1} of {self.file_list.count()}")
-        
-        # Start encoding thread
-        self.encoder_thread = EncoderThread(
-            self.encoder,
-            input_path,
-            output_path,
-            quality,
-            target_size,
-            output_format
-        )
-        
-        # Connect signals
-        self.encoder_thread.progress_update.connect(self.update_progress)
-        self.encoder_thread.encoding_finished.connect(self.file_encoding_finished)
-        
-        # Start thread
-        self.encoder_thread.start()
+        # Each running ffmpeg gets its share of the cores
+        threads = max(1, self.encoder.physical_cores // self.encode_workers)
+        return EncodeJob(self.encoder, row, input_path, output_path, quality, target_size,
+                         output_format, threads, video_info or None)
     
-    def update_progress(self, value: int, message: str):
+    @pyqtSlot(int, int, str)
+    def update_progress(self, row: int, value: int, message: str):
         """Update the progress bar and status"""
-        self.progress_bar.setValue(value)
-        self.status_label.setText(message)
+        job = self.jobs.get(row)
+        if job is None:
+            return
+        self.job_progress[row] = value
+        self.set_progress(self.batch_percent())
+        self.status_label.setText(f"{os.path.basename(job.input_path)}: {message}")
+    
+    def set_progress(self, value: int):
+        """Set the progress bar, skipping the repaint when the value is unchanged"""
+        if value != self.progress_bar.value():
+            self.progress_bar.setValue(value)
+    
+    def batch_percent(self) -> int:
+        """Overall progress of the running batch (0-100)"""
+        if not self.batch_size:
+            return 0
+        done = self.completed_count * 100 + sum(self.job_progress.values())
+        return done // self.batch_size
     
-    def file_encoding_finished(self, success: bool, message: str):
+    @pyqtSlot(int, bool, str)
+    def file_encoding_finished(self, row: int, success: bool, message: str):
         """Handle completion of file encoding"""
         try:
+            job = self.jobs.pop(row, None)
+            self.job_progress.pop(row, None)
+            self.completed_count += 1
+            
             # Update progress bar and status
-            self.progress_bar.setValue(100 if success else 0)
+            self.set_progress(self.batch_percent())
             self.status_label.setText(message)
             
-            # Get encoding settings - handle potential errors
-            try:
-                quality, output_format, target_size, output_dir, prefix_template, input_options = self.encoding_form.get_settings()
-            except Exception as settings_error:
-                logger.error(f"Error getting encoding settings: {settings_error}")
-                quality, output_format, target_size, output_dir, prefix_template = "medium", "mp4", None, "", "{filename}"
-                input_options = {'mode': 'files', 'directory': '', 'recursive': False}
-            
             # Update status
             if success:
-                self.statusBar.showMessage(f"Encoding completed successfully")
+                self.statusBar.showMessage(f"Encoded {self.completed_count} of {self.batch_size} files")
             else:
+                self.failed_count += 1
                 self.statusBar.showMessage(f"Encoding failed: {message}")
+                # A failed encode leaves its output name free for the next attempt
+                if job is not None:
+                    self.file_manager.release_output_path(job.output_path)
             
-            # Enable/disable buttons
-            self.start_button.setEnabled(True)
-            self.stop_button.setEnabled(False)
-            
-            # Reset encoder thread
-            self.encoder_thread = None
+            self.mark_row_finished(row, success)
         except Exception as e:
             logger.error(f"Error in file_encoding_finished: {e}", exc_info=True)
             self.statusBar.showMessage(f"Error: {str(e)}")
-            self.start_button.setEnabled(True)
-            self.stop_button.setEnabled(False)
-    
-        # Update status
-        item = self.file_list.item(self.file_list.current_index)
-        if item:
-            if success:
-                item.setBackground(Qt.green)
-            else:
-                item.setBackground(Qt.red)
         
-        # Move to next file
-        self.file_list.current_index += 1
-        
-        # Get settings again in case they were changed
-        try:
-            quality, output_format, target_size, output_dir, prefix_template, _ = self.encoding_form.get_settings()
-        except Exception as settings_error:
-            logger.error(f"Error getting encoding settings: {settings_error}")
-            quality, output_format, target_size, output_dir, prefix_template = "medium", "mp4", None, "", "{filename}"
-        
-        # Process next file or finish
-        if self.file_list.current_index < self.file_list.count():
-            self.process_next_file(quality, output_format, target_size, output_dir, prefix_template)
-        else:
-            self.encoding_finished(True, "All files processed")
+        self.check_batch_finished()
     
+    @pyqtSlot(bool, str)
     def encoding_finished(self, success: bool, message: str):
         """Handle completion of all encoding"""
+        self.batch_running = False
+        self.flush_row_colors()
+        
         # Re-enable UI
         self.set_ui_enabled(True)
         
@@ -675,9 +953,12 @@ class MainWindow(QMainWindow):
     
     def stop_encoding(self):
         """Stop the encoding process"""
-        if self.encoder_thread and self.encoder_thread.isRunning():
-            # Cancel the thread
-            self.encoder_thread.cancel()
+        if self.batch_running:
+            # Cancel running jobs; queued ones finish immediately without encoding
+            # and pending files are dropped
+            self.batch_cancelled = True
+            for job in self.jobs.values():
+                job.cancel()
             
             # Update status
             self.status_label.setText("Cancelling...")
@@ -705,12 +986,10 @@ class MainWindow(QMainWindow):
     
     def dropEvent(self, event: QDropEvent):
         """Handle drop events for drag and drop"""
-        files = []
-        for url in event.mimeData().urls():
-            # Convert QUrl to local path
-            file_path = url.toLocalFile()
-            if os.path.isfile(file_path):
-                files.append(file_path)
+        # No stat here: add_files_to_list filters by extension and FileListWidget.add_file
+        # checks that each remaining path is a file, so one stat per file is enough
+        local_paths = (url.toLocalFile() for url in event.mimeData().urls())
+        files = [file_path for file_path in local_paths if file_path]
         
         if files:
             self.add_files_to_list(files)
@@ -721,7 +1000,7 @@ class MainWindow(QMainWindow):
         self.settings.save_settings()
         
         # Check if encoding is in progress
-        if self.encoder_thread and self.encoder_thread.isRunning():
+        if self.batch_running:
             reply = QMessageBox.question(
                 self,
                 "Encoding in Progress",
@@ -731,8 +1010,9 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                # Stop encoding and accept close event
+                # Stop encoding, let running ffmpeg processes exit and accept close event
                 self.stop_encoding()
+                self.encode_pool.waitForDone()
                 event.accept()
             else:
                 # Ignore close event
@@ -740,42 +1020,3 @@ class MainWindow(QMainWindow):
         else:
             # No encoding in progress, accept close event
             event.accept()
-
-
-def add_directory(self):
-    """Add all supported files from a directory"""
-    try:
-        # Get directory from encoding form
-        _, _, _, _, _, input_options = self.encoding_form.get_settings()
-        directory = input_options.get('directory', '')
-        recursive = input_options.get('recursive', False)
-        
-        if not directory or not os.path.isdir(directory):
-            QMessageBox.warning(self, "Invalid Directory", "Please select a valid directory first")
-            return
-        
-        # Show loading indicator
-        self.statusBar.showMessage("Scanning directory...")
-        QApplication.processEvents()  # Update UI
-        
-        # Scan directory for supported files
-        files = self.file_manager.scan_directory(directory, recursive)
-        
-        # Sort files alphabetically
-        files.sort()
-        
-        # Add files to list
-        self.clear_files()  # Clear existing files
-        count = self.file_list.add_files(files)
-        
-        # Update status with count
-        if count > 0:
-            self.statusBar.showMessage(f"Added {count} files from directory")
-            self.status_label.setText(f"Ready - {count} files loaded")
-        else:
-            self.statusBar.showMessage("No supported files found in directory")
-            self.status_label.setText("No supported files found")
-            
-    except Exception as e:
-        logger.error(f"Error adding directory: {e}", exc_info=True)
-        self.statusBar.showMessage(f"Error scanning directory: {str(e)}")
\ No newline at end of file
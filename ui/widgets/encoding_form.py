@@ -7,6 +7,7 @@ Implements the form for configuring video encoding settings
 """
 
 import os
+import re
 import logging
 from typing import Dict, List, Optional, Tuple
 
@@ -17,27 +18,138 @@ from PyQt5.QtWidgets import (
     QFormLayout, QCheckBox, QRadioButton, QButtonGroup,
     QTextEdit  # Added missing QTextEdit import
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
+from PyQt5.QtCore import Qt, QSize, QEvent, QTimer, pyqtSignal, pyqtSlot
 
 from config.settings import Settings
 from core.prefix_manager import PrefixManager
 
 logger = logging.getLogger('video_encoder.ui.widgets.encoding_form')
 
+# Fallback start directory for the browse dialogs
+_HOME = os.path.expanduser('~')
+
+# Placeholder names used in a template
+_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+
+# Help pane HTML, built once; update_help_text only switches between sections
+_HELP_HEADER = "<html><body style='font-family: Arial, sans-serif;'>"
+_HELP_FOOTER = "</body></html>"
+
+# Quality preset, output format and target size
+_QUALITY_HELP = _HELP_HEADER + (
+    "<h3>Quality Settings</h3>"
+    "<p><b>Quality Preset:</b> Determines the compression level and visual quality.</p>"
+    "<ul>"
+    "<li><b>Very Low to Very High:</b> General quality presets with varying compression levels</li>"
+    "<li><b>144p to 2160p:</b> Resolution-specific presets</li>"
+    "</ul>"
+    "<p><b>Output Format:</b> The container format for your video.</p>"
+    "<ul>"
+    "<li><b>MP4:</b> Best compatibility with most devices</li>"
+    "<li><b>MKV:</b> Better for storing multiple audio tracks and subtitles</li>"
+    "<li><b>WebM:</b> Optimized for web playback</li>"
+    "<li><b>MOV:</b> Good compatibility with Apple devices</li>"
+    "</ul>"
+    "<p><b>Target Size:</b> Enable to specify a target file size in MB.</p>"
+) + _HELP_FOOTER
+
+# Files vs directory input
+_INPUT_HELP = _HELP_HEADER + (
+    "<h3>Input Mode</h3>"
+    "<p>Choose how you want to select files for conversion:</p>"
+    "<ul>"
+    "<li><b>Individual Files:</b> Select specific video files to convert</li>"
+    "<li><b>Directory:</b> Convert all supported videos in a directory</li>"
+    "</ul>"
+    "<p>When using Directory mode, you can choose to include subdirectories in the scan.</p>"
+) + _HELP_FOOTER
+
+# Filename template
+_TEMPLATE_HELP = _HELP_HEADER + (
+    "<h3>Filename Template</h3>"
+    "<p>Customize how output files will be named using placeholders.</p>"
+    "<p>Common placeholders:</p>"
+    "<ul>"
+    "<li><b>{filename}</b>: Original filename without extension</li>"
+    "<li><b>{quality}</b>: Selected quality preset</li>"
+    "<li><b>{resolution}</b>: Video resolution (WIDTHxHEIGHT)</li>"
+    "<li><b>{date}</b>: Current date (YYYY-MM-DD)</li>"
+    "</ul>"
+    "<p>Click in this help section to see all available placeholders.</p>"
+) + _HELP_FOOTER
+
+# Startup overview
+_GENERAL_HELP = _HELP_HEADER + (
+    "<h3>Bulk Video Converter</h3>"
+    "<p>This application helps you convert multiple video files with consistent settings.</p>"
+    "<p><b>Basic workflow:</b></p>"
+    "<ol>"
+    "<li>Add video files using the 'Add Files' button</li>"
+    "<li>Configure quality settings and output format</li>"
+    "<li>Set your output directory</li>"
+    "<li>Customize the filename template if needed</li>"
+    "<li>Click 'Start Encoding' to begin conversion</li>"
+    "</ol>"
+    "<p>Click on different parts of the form to see specific help.</p>"
+) + _HELP_FOOTER
+
+_HELP_SECTIONS = {
+    'quality': _QUALITY_HELP,
+    'input': _INPUT_HELP,
+    'template': _TEMPLATE_HELP,
+    'general': _GENERAL_HELP
+}
+
 
 class EncodingForm(QWidget):
     """Form for configuring video encoding settings"""
     
+    # Named quality presets and their position in the quality combo box
+    QUALITY_INDEXES = {
+        'very_low': 0,
+        'low': 1,
+        'medium': 2,
+        'high': 3,
+        'very_high': 4
+    }
+    
+    # Resolution-specific quality presets
+    RESOLUTION_PRESETS = frozenset({'144p', '240p', '360p', '480p', '720p', '1080p', '1440p', '2160p'})
+    
+    # Example placeholder values for the filename preview ({quality} comes from the form)
+    EXAMPLE_VALUES = {
+        'filename': 'video',
+        'ext': 'mp4',
+        'date': '2025-05-06',
+        'time': '18-35-34',
+        'datetime': '2025-05-06_18-35-34',
+        'create_date': '2025-05-01',
+        'size': '100',
+        'resolution': '1920x1080',
+        'codec': 'h264',
+        'duration': '120.5',
+        'counter': '1',
+        'source': 'videos',
+        'source_full': 'C:\\videos'
+    }
+    
     def __init__(self, settings: Settings, prefix_manager: PrefixManager):
         super().__init__()
         self.settings = settings
         self.prefix_manager = prefix_manager
+        self.last_valid_dir = None  # Last directory confirmed to exist, for the browse dialogs
+        self.help_section = None  # Help section currently shown
+        self.pending_help_section = None  # Section to show once the hidden help pane appears
+        self.placeholder_help_html = None  # Placeholder help, built on first use
         
         # Initialize UI
         self.init_ui()
         
         # Load default values from settings
         self.load_defaults()
+        
+        # Context help, once the form holds its initial values
+        self.connect_help_signals()
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -146,7 +258,12 @@ class EncodingForm(QWidget):
         # Replace prefix combo with direct input field
         self.custom_prefix_edit = QLineEdit()
         self.custom_prefix_edit.setPlaceholderText("Enter filename template e.g. {filename}_{quality}")
-        self.custom_prefix_edit.textChanged.connect(self.update_prefix_preview)
+        # Typing restarts the timer, so a burst of keystrokes renders the preview once
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(80)
+        self.preview_timer.timeout.connect(self.update_prefix_preview)
+        self.custom_prefix_edit.textChanged.connect(self.preview_timer.start)
         output_layout.addRow("Filename Template:", self.custom_prefix_edit)
         
         # Preview of prefix template
@@ -173,17 +290,24 @@ class EncodingForm(QWidget):
         self.help_text.setMinimumWidth(250)
         self.help_text.setStyleSheet("background-color: #f5f5f5;")
         help_layout.addWidget(self.help_text)
+        self.help_text.installEventFilter(self)  # Renders deferred help when the pane is shown
         
         # Add help group to main layout
         main_layout.addWidget(help_group, 1)  # 2:1 ratio with form
+    
+    def connect_help_signals(self):
+        """Connect the form controls to the context help and show the general section
         
-        # Connect signals for help text updates
-        self.quality_combo.currentIndexChanged.connect(self.update_help_text)
-        self.format_combo.currentIndexChanged.connect(self.update_help_text)
-        self.target_size_check.stateChanged.connect(self.update_help_text)
-        self.files_radio.toggled.connect(self.update_help_text)
-        self.directory_radio.toggled.connect(self.update_help_text)
-        self.custom_prefix_edit.textChanged.connect(self.update_help_text)
+        Called after load_defaults, so filling in the defaults doesn't switch
+        the help pane away from the startup overview.
+        """
+        # Through a no-argument slot, so signal values aren't taken as show_placeholders
+        self.quality_combo.currentIndexChanged.connect(self.update_context_help)
+        self.format_combo.currentIndexChanged.connect(self.update_context_help)
+        self.target_size_check.stateChanged.connect(self.update_context_help)
+        self.files_radio.toggled.connect(self.update_context_help)
+        self.directory_radio.toggled.connect(self.update_context_help)
+        self.custom_prefix_edit.textChanged.connect(self.update_context_help)
         
         # Initial help text
         self.update_help_text()
@@ -205,9 +329,7 @@ class EncodingForm(QWidget):
     def browse_input_directory(self):
         """Open directory dialog to select input directory"""
         try:
-            current_dir = self.directory_path_edit.text()
-            if not current_dir or not os.path.isdir(current_dir):
-                current_dir = os.path.expanduser('~')
+            current_dir = self.get_dialog_start_dir(self.directory_path_edit.text())
             
             directory = QFileDialog.getExistingDirectory(
                 self,
@@ -217,6 +339,7 @@ class EncodingForm(QWidget):
             )
             
             if directory:
+                self.last_valid_dir = directory
                 self.directory_path_edit.setText(directory)
                 
                 # Trigger directory scan if parent window exists
@@ -226,18 +349,27 @@ class EncodingForm(QWidget):
         except Exception as e:
             logger.error(f"Error browsing directory: {e}")
     
+    def get_dialog_start_dir(self, current_dir: str) -> str:
+        """Get the directory a browse dialog should open in
+        
+        Args:
+            current_dir: Directory currently entered in the form
+            
+        Returns:
+            current_dir if it exists, otherwise the home directory
+        """
+        if current_dir and current_dir == self.last_valid_dir:
+            return current_dir
+        if current_dir and os.path.isdir(current_dir):
+            self.last_valid_dir = current_dir
+            return current_dir
+        return _HOME
+    
     def load_defaults(self):
         """Load default values from settings"""
         # Set quality preset
-        quality_map = {
-            'very_low': 0,
-            'low': 1,
-            'medium': 2,
-            'high': 3,
-            'very_high': 4
-        }
         default_quality = self.settings.get('default_quality', 'medium')
-        self.quality_combo.setCurrentIndex(quality_map.get(default_quality, 2))
+        self.quality_combo.setCurrentIndex(self.QUALITY_INDEXES.get(default_quality, 2))
         
         # Set output format
         default_format = self.settings.get('default_format', 'mp4')
@@ -275,93 +407,75 @@ class EncodingForm(QWidget):
         """Show help for placeholders in the help text area instead of a dialog"""
         self.update_help_text(show_placeholders=True)
     
+    @pyqtSlot()
+    def update_context_help(self):
+        """Show the help section for the control that emitted the signal"""
+        self.update_help_text()
+    
     def update_help_text(self, show_placeholders=False):
         """Update the help text based on current selection"""
-        help_html = "<html><body style='font-family: Arial, sans-serif;'>"
-        
         # If showing placeholders specifically
         if show_placeholders:
-            help_html += "<h3>Available Template Placeholders</h3>"
-            help_html += "<p>You can use these placeholders in your filename template:</p>"
-            help_html += "<ul>"
-            
-            placeholders = self.prefix_manager.get_available_placeholders()
-            for placeholder, description in placeholders.items():
-                help_html += f"<li><b>{placeholder}</b>: {description}</li>"
-            
-            help_html += "</ul>"
-            help_html += "<p>Example: <code>{filename}_{quality}_{resolution}</code></p>"
+            current_section = "placeholders"
+        
+        # Otherwise show context-sensitive help: check which section is being interacted with
+        elif self.sender() in (self.quality_combo, self.format_combo, self.target_size_check):
+            current_section = "quality"
+        elif self.sender() in (self.files_radio, self.directory_radio):
+            current_section = "input"
+        elif self.sender() == self.custom_prefix_edit:
+            current_section = "template"
+        else:
+            # Default section on startup
+            current_section = "general"
+        
+        # Hidden pane: remember the section and render it once the pane is shown
+        if not self.help_text.isVisible():
+            self.pending_help_section = current_section
+            return
+        self.show_help_section(current_section)
+    
+    def show_help_section(self, current_section: str):
+        """Put a help section's HTML into the help pane
+        
+        Args:
+            current_section: Key of _HELP_SECTIONS, or "placeholders"
+        """
+        self.pending_help_section = None
         
-        # Otherwise show context-sensitive help
+        # Same section as shown: skip re-parsing and re-laying out the document
+        if current_section == self.help_section:
+            return
+        self.help_section = current_section
+        
+        if current_section == "placeholders":
+            help_html = self.get_placeholder_help_html()
         else:
-            # Get current context
-            current_section = ""
-            
-            # Check which section is being interacted with
-            if self.sender() == self.quality_combo or self.sender() == self.format_combo or self.sender() == self.target_size_check:
-                current_section = "quality"
-            elif self.sender() == self.files_radio or self.sender() == self.directory_radio:
-                current_section = "input"
-            elif self.sender() == self.custom_prefix_edit:
-                current_section = "template"
-            else:
-                # Default section on startup
-                current_section = "general"
-            
-            # Generate help content based on context
-            if current_section == "quality":
-                help_html += "<h3>Quality Settings</h3>"
-                help_html += "<p><b>Quality Preset:</b> Determines the compression level and visual quality.</p>"
-                help_html += "<ul>"
-                help_html += "<li><b>Very Low to Very High:</b> General quality presets with varying compression levels</li>"
-                help_html += "<li><b>144p to 2160p:</b> Resolution-specific presets</li>"
-                help_html += "</ul>"
-                help_html += "<p><b>Output Format:</b> The container format for your video.</p>"
-                help_html += "<ul>"
-                help_html += "<li><b>MP4:</b> Best compatibility with most devices</li>"
-                help_html += "<li><b>MKV:</b> Better for storing multiple audio tracks and subtitles</li>"
-                help_html += "<li><b>WebM:</b> Optimized for web playback</li>"
-                help_html += "<li><b>MOV:</b> Good compatibility with Apple devices</li>"
-                help_html += "</ul>"
-                help_html += "<p><b>Target Size:</b> Enable to specify a target file size in MB.</p>"
-            
-            elif current_section == "input":
-                help_html += "<h3>Input Mode</h3>"
-                help_html += "<p>Choose how you want to select files for conversion:</p>"
-                help_html += "<ul>"
-                help_html += "<li><b>Individual Files:</b> Select specific video files to convert</li>"
-                help_html += "<li><b>Directory:</b> Convert all supported videos in a directory</li>"
-                help_html += "</ul>"
-                help_html += "<p>When using Directory mode, you can choose to include subdirectories in the scan.</p>"
-            
-            elif current_section == "template":
-                help_html += "<h3>Filename Template</h3>"
-                help_html += "<p>Customize how output files will be named using placeholders.</p>"
-                help_html += "<p>Common placeholders:</p>"
-                help_html += "<ul>"
-                help_html += "<li><b>{filename}</b>: Original filename without extension</li>"
-                help_html += "<li><b>{quality}</b>: Selected quality preset</li>"
-                help_html += "<li><b>{resolution}</b>: Video resolution (WIDTHxHEIGHT)</li>"
-                help_html += "<li><b>{date}</b>: Current date (YYYY-MM-DD)</li>"
-                help_html += "</ul>"
-                help_html += "<p>Click in this help section to see all available placeholders.</p>"
-            
-            else:  # general
-                help_html += "<h3>Bulk Video Converter</h3>"
-                help_html += "<p>This application helps you convert multiple video files with consistent settings.</p>"
-                help_html += "<p><b>Basic workflow:</b></p>"
-                help_html += "<ol>"
-                help_html += "<li>Add video files using the 'Add Files' button</li>"
-                help_html += "<li>Configure quality settings and output format</li>"
-                help_html += "<li>Set your output directory</li>"
-                help_html += "<li>Customize the filename template if needed</li>"
-                help_html += "<li>Click 'Start Encoding' to begin conversion</li>"
-                help_html += "</ol>"
-                help_html += "<p>Click on different parts of the form to see specific help.</p>"
-            
-        help_html += "</body></html>"
+            help_html = _HELP_SECTIONS[current_section]
         self.help_text.setHtml(help_html)
     
+    def eventFilter(self, obj, event):
+        """Render help deferred while the help pane was hidden"""
+        if (obj is self.help_text and event.type() == QEvent.Show
+                and self.pending_help_section is not None):
+            self.show_help_section(self.pending_help_section)
+        return super().eventFilter(obj, event)
+    
+    def get_placeholder_help_html(self) -> str:
+        """Get the placeholder list HTML, building it on first use"""
+        if self.placeholder_help_html is None:
+            items = "".join(f"<li><b>{placeholder}</b>: {description}</li>"
+                            for placeholder, description in self.prefix_manager.get_available_placeholders().items())
+            self.placeholder_help_html = (
+                _HELP_HEADER
+                + "<h3>Available Template Placeholders</h3>"
+                + "<p>You can use these placeholders in your filename template:</p>"
+                + "<ul>" + items + "</ul>"
+                + "<p>Example: <code>{filename}_{quality}_{resolution}</code></p>"
+                + _HELP_FOOTER
+            )
+        return self.placeholder_help_html
+    
     def update_prefix_preview(self):
         """Update the preview of the prefix template"""
         try:
@@ -371,29 +485,17 @@ class EncodingForm(QWidget):
             # Get current format
             output_format = self.format_combo.currentText()
             
-            # Create a preview with example values
-            preview = template
+            # Replace placeholders with example values in one pass; unknown ones stay as written
+            example_values = self.EXAMPLE_VALUES
+            quality = self.quality_combo.currentText()
             
-            # Replace placeholders with example values
-            example_values = {
-                '{filename}': 'video',
-                '{ext}': 'mp4',
-                '{date}': '2025-05-06',
-                '{time}': '18-35-34',
-                '{datetime}': '2025-05-06_18-35-34',
-                '{create_date}': '2025-05-01',
-                '{size}': '100',
-                '{resolution}': '1920x1080',
-                '{codec}': 'h264',
-                '{duration}': '120.5',
-                '{counter}': '1',
-                '{quality}': self.quality_combo.currentText(),
-                '{source}': 'videos',
-                '{source_full}': 'C:\\videos'
-            }
+            def example_value(match):
+                name = match.group(1)
+                if name == 'quality':
+                    return quality
+                return example_values.get(name, match.group(0))
             
-            for placeholder, value in example_values.items():
-                preview = preview.replace(placeholder, value)
+            preview = _PLACEHOLDER_RE.sub(example_value, template)
             
             # Add extension
             preview = f"{preview}.{output_format}"
@@ -410,9 +512,7 @@ class EncodingForm(QWidget):
     
     def browse_output_dir(self):
         """Open directory dialog to select output directory"""
-        current_dir = self.output_dir_edit.text()
-        if not current_dir or not os.path.isdir(current_dir):
-            current_dir = os.path.expanduser('~')
+        current_dir = self.get_dialog_start_dir(self.output_dir_edit.text())
         
         directory = QFileDialog.getExistingDirectory(
             self,
@@ -422,6 +522,7 @@ class EncodingForm(QWidget):
         )
         
         if directory:
+            self.last_valid_dir = directory
             self.output_dir_edit.setText(directory)
             # Save to settings
             self.settings.set('output_directory', directory)
@@ -451,28 +552,29 @@ class EncodingForm(QWidget):
         prefix_template = self.custom_prefix_edit.text()
         
         # Input options
+        directory, recursive = self.get_input_options()
         input_options = {
             'mode': 'directory' if self.directory_radio.isChecked() else 'files',
-            'directory': self.directory_path_edit.text() if self.directory_radio.isChecked() else '',
-            'recursive': self.recursive_check.isChecked()
+            'directory': directory,
+            'recursive': recursive
         }
         
         return quality, output_format, target_size, output_dir, prefix_template, input_options
     
+    def get_input_options(self) -> Tuple[str, bool]:
+        """Get only the directory input settings
+        
+        Returns:
+            Tuple of (directory, recursive); directory is '' unless directory mode is selected
+        """
+        directory = self.directory_path_edit.text() if self.directory_radio.isChecked() else ''
+        return directory, self.recursive_check.isChecked()
+    
     def get_quality_value(self) -> str:
         """Get the current quality value as a string"""
         quality_text = self.quality_combo.currentText().lower().replace(' ', '_')
         
-        # Handle resolution presets
-        if quality_text in ['144p', '240p', '360p', '480p', '720p', '1080p', '1440p', '2160p']:
+        # Resolution and named presets map to themselves
+        if quality_text in self.RESOLUTION_PRESETS or quality_text in self.QUALITY_INDEXES:
             return quality_text
-            
-        # Handle named presets
-        quality_map = {
-            'very_low': 'very_low',
-            'low': 'low',
-            'medium': 'medium',
-            'high': 'high',
-            'very_high': 'very_high'
-        }
-        return quality_map.get(quality_text, 'medium')
\ No newline at end of file
+        return 'medium'
\ No newline at end of file
@@ -8,28 +8,138 @@ Implements a list widget for managing video files to be encoded
 
 import os
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QMenu, QAction
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QIcon, QPixmap, QDragEnterEvent, QDropEvent
+from PyQt5.QtWidgets import QListView, QAbstractItemView, QMenu, QAction
+from PyQt5.QtCore import Qt, QUrl, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap, QBrush, QColor, QDragEnterEvent, QDragMoveEvent, QDropEvent
 
 logger = logging.getLogger('video_encoder.ui.widgets.file_list')
 
+# Row backgrounds for finished files
+_SUCCESS_BRUSH = QBrush(QColor(Qt.green))
+_FAILURE_BRUSH = QBrush(QColor(Qt.red))
 
-class FileListWidget(QListWidget):
-    """Custom list widget for managing video files"""
+
+class FilePathsModel(QAbstractListModel):
+    """List model over plain Python lists of file paths
+    
+    Rows are kept as parallel lists (path, display name, background) instead
+    of one item object per file, and views are only told about whole ranges.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = []  # Full path of each row
+        self.names = []  # File name shown for each row
+        self.backgrounds = []  # QBrush for each row, or None
+        self.path_set = set()  # Same paths, for constant-time duplicate checks
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Number of rows (the list has no children)"""
+        return 0 if parent.isValid() else len(self.paths)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Data for a row: file name for display, full path for tooltip and UserRole"""
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.names[row]
+        if role == Qt.ToolTipRole or role == Qt.UserRole:
+            return self.paths[row]
+        if role == Qt.BackgroundRole:
+            return self.backgrounds[row]
+        return None
+    
+    def append_paths(self, file_paths: List[str]):
+        """Append rows for new paths with a single insert notification
+        
+        Args:
+            file_paths: Paths not yet in the model
+        """
+        if not file_paths:
+            return
+        first = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_paths) - 1)
+        self.paths.extend(file_paths)
+        self.names.extend(os.path.basename(file_path) for file_path in file_paths)
+        self.backgrounds.extend([None] * len(file_paths))
+        self.path_set.update(file_paths)
+        self.endInsertRows()
+    
+    def remove_row_range(self, start: int, count: int):
+        """Remove count rows starting at start"""
+        end = start + count
+        self.beginRemoveRows(QModelIndex(), start, end - 1)
+        self.path_set.difference_update(self.paths[start:end])
+        del self.paths[start:end]
+        del self.names[start:end]
+        del self.backgrounds[start:end]
+        self.endRemoveRows()
+    
+    def clear(self):
+        """Remove every row"""
+        self.beginResetModel()
+        self.paths = []
+        self.names = []
+        self.backgrounds = []
+        self.path_set = set()
+        self.endResetModel()
+    
+    def set_backgrounds(self, backgrounds: Dict[int, Optional[QBrush]]):
+        """Set row backgrounds with one change notification for the affected range
+        
+        Args:
+            backgrounds: Row -> brush (rows outside the model are ignored)
+        """
+        rows = [row for row in backgrounds if 0 <= row < len(self.paths)]
+        if not rows:
+            return
+        for row in rows:
+            self.backgrounds[row] = backgrounds[row]
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [Qt.BackgroundRole])
+
+
+class FileListWidget(QListView):
+    """Custom list view for managing video files"""
+    
+    # Drops larger than this are checked by reading their parent directories
+    DROP_SCAN_THRESHOLD = 100
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.current_index = 0  # Index of current file being processed
+        self.path_model = FilePathsModel(self)
+        self.setModel(self.path_model)
         
         # Setup widget properties
+        self.setUniformItemSizes(True)  # Rows all have one height; no per-row size queries
         self.setAcceptDrops(True)
-        self.setSelectionMode(QListWidget.ExtendedSelection)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
+        
+        # Context menu, built once and reused on every right-click
+        self.context_menu = QMenu(self)
+        
+        remove_action = QAction("Remove Selected", self)
+        remove_action.triggered.connect(self.remove_selected_files)
+        self.context_menu.addAction(remove_action)
+        
+        clear_action = QAction("Clear All", self)
+        clear_action.triggered.connect(self.clear)
+        self.context_menu.addAction(clear_action)
+    
+    @property
+    def paths(self) -> List[str]:
+        """Full path of each row, in row order (shared; do not modify)"""
+        return self.path_model.paths
+    
+    def count(self) -> int:
+        """Number of files in the list"""
+        return len(self.path_model.paths)
     
     def add_file(self, file_path: str) -> bool:
         """Add a file to the list
@@ -40,44 +150,50 @@ class FileListWidget(QListWidget):
         Returns:
             True if file was added, False otherwise
         """
-        try:
-            # Check if file exists
-            if not os.path.isfile(file_path):
-                logger.warning(f"File does not exist: {file_path}")
-                return False
-            
-            # Check if file is already in the list
-            for i in range(self.count()):
-                if self.item(i).data(Qt.UserRole) == file_path:
-                    logger.info(f"File already in list: {file_path}")
-                    return False
-            
-            # Create list item
-            item = QListWidgetItem(os.path.basename(file_path))
-            item.setData(Qt.UserRole, file_path)  # Store full path as user data
-            item.setToolTip(file_path)
-            
-            # Add to list
-            self.addItem(item)
-            return True
-        except Exception as e:
-            logger.error(f"Error adding file: {e}")
-            return False
+        return self.add_files([file_path]) == 1
     
-    def add_files(self, file_paths: List[str]) -> int:
+    def add_files(self, file_paths: List[str], known_files: bool = False) -> int:
         """Add multiple files to the list
         
         Args:
             file_paths: List of file paths
+            known_files: True if the paths are known to be files (e.g. from a
+                directory scan), so they are not stat()ed again
             
         Returns:
             Number of files successfully added
         """
-        count = 0
-        for file_path in file_paths:
-            if self.add_file(file_path):
-                count += 1
-        return count
+        try:
+            # Filter first, then insert every new row in one model insertion
+            path_set = self.path_model.path_set
+            new_paths = []
+            seen = set()
+            for file_path in file_paths:
+                if file_path in path_set or file_path in seen:
+                    logger.info(f"File already in list: {file_path}")
+                    continue
+                if not known_files and not os.path.isfile(file_path):
+                    logger.warning(f"File does not exist: {file_path}")
+                    continue
+                seen.add(file_path)
+                new_paths.append(file_path)
+            
+            self.path_model.append_paths(new_paths)
+            return len(new_paths)
+        except Exception as e:
+            logger.error(f"Error adding files: {e}")
+            return 0
+    
+    def mark_results(self, results: Dict[int, bool]):
+        """Color finished rows green (success) or red (failure)
+        
+        Args:
+            results: Row -> success
+        """
+        self.path_model.set_backgrounds({
+            row: _SUCCESS_BRUSH if success else _FAILURE_BRUSH
+            for row, success in results.items()
+        })
     
     def remove_selected_files(self) -> int:
         """Remove selected files from the list
@@ -85,17 +201,25 @@ class FileListWidget(QListWidget):
         Returns:
             Number of files removed
         """
-        selected_items = self.selectedItems()
-        count = len(selected_items)
+        # Selected rows, highest first, so earlier rows keep their numbers while removing
+        rows = sorted({index.row() for index in self.selectionModel().selectedIndexes()}, reverse=True)
+        count = len(rows)
+        if not count:
+            return 0
         
-        # Remove items in reverse order to avoid index issues
-        for item in reversed(selected_items):
-            row = self.row(item)
-            self.takeItem(row)
-            
-            # Adjust current_index if needed
-            if row < self.current_index:
-                self.current_index -= 1
+        # Adjust current_index for the rows removed before it
+        self.current_index -= sum(1 for row in rows if row < self.current_index)
+        
+        # Remove each run of contiguous rows with one model call
+        i = 0
+        while i < count:
+            end = rows[i]
+            start = end
+            i += 1
+            while i < count and rows[i] == start - 1:
+                start -= 1
+                i += 1
+            self.path_model.remove_row_range(start, end - start + 1)
         
         # Ensure current_index is valid
         if self.current_index >= self.count():
@@ -105,19 +229,7 @@ class FileListWidget(QListWidget):
     
     def show_context_menu(self, position):
         """Show context menu for the list"""
-        menu = QMenu()
-        
-        # Add actions
-        remove_action = QAction("Remove Selected", self)
-        remove_action.triggered.connect(self.remove_selected_files)
-        menu.addAction(remove_action)
-        
-        clear_action = QAction("Clear All", self)
-        clear_action.triggered.connect(self.clear)
-        menu.addAction(clear_action)
-        
-        # Show menu
-        menu.exec_(self.mapToGlobal(position))
+        self.context_menu.exec_(self.mapToGlobal(position))
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter events for drag and drop"""
@@ -126,23 +238,65 @@ class FileListWidget(QListWidget):
                 event.acceptProposedAction()
         except Exception as e:
             logger.error(f"Error in drag enter event: {e}")
+    
+    def dragMoveEvent(self, event: QDragMoveEvent):
+        """Keep accepting file drags over the rows (the model itself takes no drops)"""
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
             
     def dropEvent(self, event: QDropEvent):
         """Handle drop events for drag and drop"""
         try:
-            files = []
-            for url in event.mimeData().urls():
-                # Convert QUrl to local path
-                file_path = url.toLocalFile()
-                if os.path.isfile(file_path):
-                    files.append(file_path)
+            urls = event.mimeData().urls()
+            if not urls:
+                return
+            
+            # Accept first, so the drag source is released before the files are processed
+            event.acceptProposedAction()
+            
+            # Convert QUrls to local paths (non-local URLs give '')
+            paths = [file_path for file_path in map(QUrl.toLocalFile, urls) if file_path]
+            
+            if len(paths) > self.DROP_SCAN_THRESHOLD:
+                # Large drop: classify with one scandir per parent directory
+                files = self.filter_files(paths)
+            else:
+                files = [file_path for file_path in paths if os.path.isfile(file_path)]
             
             if files and self.parent:
-                self.parent.add_files_to_list(files)
+                self.parent.add_files_to_list(files, known_files=True)
         except Exception as e:
             logger.error(f"Error in drop event: {e}")
     
+    def filter_files(self, paths: List[str]) -> List[str]:
+        """Keep the paths that are regular files, reading each parent directory once
+        
+        Args:
+            paths: Paths to check
+            
+        Returns:
+            Paths that are files, in their original order
+        """
+        by_parent = {}
+        for file_path in paths:
+            parent, name = os.path.split(file_path)
+            by_parent.setdefault(parent, set()).add(name)
+        
+        is_file = set()  # (parent, name) pairs, so paths never need re-joining
+        for parent, names in by_parent.items():
+            try:
+                with os.scandir(parent or os.curdir) as entries:
+                    for entry in entries:
+                        if entry.name in names and entry.is_file():
+                            is_file.add((parent, entry.name))
+            except OSError:
+                # Unreadable directory: check the dropped names one by one
+                is_file.update((parent, name) for name in names
+                               if os.path.isfile(os.path.join(parent, name)))
+        
+        return [file_path for file_path in paths if os.path.split(file_path) in is_file]
+    
     def clear(self):
         """Clear all items from the list"""
-        super().clear()
+        self.path_model.clear()
         self.current_index = 0
\ No newline at end of file
@@ -8,7 +8,9 @@ Implements a dialog for configuring application settings
 
 import os
 import logging
-from typing import Dict, List, Optional
+import functools
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
@@ -17,22 +19,89 @@ from PyQt5.QtWidgets import (
     QDialogButtonBox, QGroupBox, QFileDialog,
     QMessageBox, QKeySequenceEdit
 )
-from PyQt5.QtCore import Qt, QSettings, QSize
+from PyQt5.QtCore import Qt, QSettings, QSize, pyqtSlot
 from PyQt5.QtGui import QKeySequence
 
 from config.settings import Settings
 
 logger = logging.getLogger('video_encoder.ui.widgets.settings_dialog')
 
+# Fallback start directory for the browse dialogs
+_HOME = os.path.expanduser('~')
+
+# Browse dialog titles and the FFmpeg file filter
+_OUTPUT_DIR_TITLE = "Select Output Directory"
+_FFMPEG_TITLE = "Select FFmpeg Executable"
+_FFMPEG_FILTER = "Executables (*.exe);;All Files (*.*)"
+
+# One settings row: the setting key and its default, the kind of editor
+# ('combo_data', 'combo_text', 'check', 'spin', 'dir' or 'file'), the row label,
+# and the editor options (combo entries, checkbox text or spin range)
+Field = namedtuple('Field', ['key', 'default', 'kind', 'label', 'options'])
+
+
+@functools.lru_cache(maxsize=None)
+def _action_label(action: str) -> str:
+    """Readable label for a shortcut action name (e.g. 'add_files' -> 'Add Files:')"""
+    return f"{action.replace('_', ' ').title()}:"
+
+
+@functools.lru_cache(maxsize=None)
+def _key_sequence(shortcut: str) -> QKeySequence:
+    """Parsed key sequence for a shortcut string (treat as read-only)"""
+    return QKeySequence(shortcut)
+
 
 class SettingsDialog(QDialog):
     """Dialog for configuring application settings"""
     
+    # Tabs and their rows, in display order; None marks the shortcuts tab,
+    # whose rows come from the configured shortcuts
+    TABS = (
+        ("General", (
+            Field('language', 'en', 'combo_data', "Language:",
+                  tuple(Settings.AVAILABLE_LANGUAGES.items())),
+            Field('theme', 'system', 'combo_data', "Theme:",
+                  tuple((theme, theme.capitalize()) for theme in Settings.AVAILABLE_THEMES)),
+            Field('output_directory', '', 'dir', "Output Directory:", None),
+            Field('check_updates', True, 'check', "", "Check for updates on startup")
+        )),
+        ("Encoding", (
+            Field('default_quality', 'medium', 'combo_text', "Default Quality:",
+                  ("very_low", "low", "medium", "high", "very_high")),
+            Field('default_format', 'mp4', 'combo_text', "Default Format:",
+                  ("mp4", "mkv", "webm", "mov")),
+            Field('default_prefix_template', 'simple', 'combo_text', "Default Filename Template:",
+                  ("simple", "with_quality", "with_date", "with_datetime", "with_resolution", "detailed", "full"))
+        )),
+        ("Interface", (
+            Field('show_tooltips', True, 'check', "", "Show tooltips"),
+            Field('confirm_overwrite', True, 'check', "", "Confirm before overwriting files"),
+            Field('remember_last_directory', True, 'check', "", "Remember last used directory"),
+            Field('max_recent_files', 10, 'spin', "Maximum recent files:", (0, 50))
+        )),
+        ("Shortcuts", None),
+        ("Advanced", (
+            Field('ffmpeg_path', '', 'file', "FFmpeg Path:", None),
+            Field('enable_logging', True, 'check', "", "Enable logging"),
+            Field('log_level', 'INFO', 'combo_text', "Log Level:",
+                  ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"))
+        ))
+    )
+    
     def __init__(self, settings: Settings, parent=None):
         super().__init__(parent)
         self.settings = settings
-        self.original_settings = {}
+        self.original_settings = None  # Snapshot to restore on cancel, taken when first needed
+        self.widgets = {}  # Setting key -> editor widget, for the tabs built so far
+        self.combo_indexes = {}  # Setting key -> {value: combo index}, so loading needs no findData/findText
         self.shortcut_edits = {}
+        self.edited_shortcuts = set()  # Actions whose editor the user changed since the last load or Apply
+        self.built_tabs = set()  # Indexes of tabs whose widgets have been created
+        self.output_dir_dialog = None  # Browse dialogs, created on first use and reused
+        self.ffmpeg_dialog = None
+        self.reset_prompt = None  # Reset confirmation box, created on first use and reused
+        self.known_paths = set()  # Paths already known to exist, so browsing doesn't stat them again
         
         # Save original settings for cancel
         self.backup_settings()
@@ -56,12 +125,15 @@ class SettingsDialog(QDialog):
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
         
-        # Create tabs
-        self.create_general_tab()
-        self.create_encoding_tab()
-        self.create_interface_tab()
-        self.create_shortcuts_tab()
-        self.create_advanced_tab()
+        # Each tab starts as an empty page and its widgets are only created
+        # the first time it is selected
+        for title, _ in self.TABS:
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(page, title)
+        self.tab_widget.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tab_widget.currentIndex())
         
         # Button box
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Apply | QDialogButtonBox.Reset)
@@ -71,89 +143,57 @@ class SettingsDialog(QDialog):
         button_box.button(QDialogButtonBox.Reset).clicked.connect(self.reset_settings)
         main_layout.addWidget(button_box)
     
-    def create_general_tab(self):
-        """Create the general settings tab"""
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        
-        # Language selection
-        self.language_combo = QComboBox()
-        for code, name in self.settings.AVAILABLE_LANGUAGES.items():
-            self.language_combo.addItem(name, code)
-        layout.addRow("Language:", self.language_combo)
-        
-        # Theme selection
-        self.theme_combo = QComboBox()
-        for theme in self.settings.AVAILABLE_THEMES:
-            self.theme_combo.addItem(theme.capitalize(), theme)
-        layout.addRow("Theme:", self.theme_combo)
-        
-        # Output directory
-        output_dir_layout = QHBoxLayout()
-        self.output_dir_edit = QLineEdit()
-        self.output_dir_edit.setReadOnly(True)
-        output_dir_layout.addWidget(self.output_dir_edit)
+    def create_form_tab(self, fields) -> QWidget:
+        """Create a settings tab with one row per field
         
-        self.browse_button = QPushButton("Browse...")
-        self.browse_button.clicked.connect(self.browse_output_dir)
-        output_dir_layout.addWidget(self.browse_button)
-        
-        layout.addRow("Output Directory:", output_dir_layout)
-        
-        # Check for updates
-        self.updates_check = QCheckBox("Check for updates on startup")
-        layout.addRow("", self.updates_check)
-        
-        self.tab_widget.addTab(tab, "General")
-    
-    def create_encoding_tab(self):
-        """Create the encoding settings tab"""
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        
-        # Default quality preset
-        self.quality_combo = QComboBox()
-        self.quality_combo.addItems(["very_low", "low", "medium", "high", "very_high"])
-        layout.addRow("Default Quality:", self.quality_combo)
-        
-        # Default output format
-        self.format_combo = QComboBox()
-        self.format_combo.addItems(["mp4", "mkv", "webm", "mov"])
-        layout.addRow("Default Format:", self.format_combo)
-        
-        # Default prefix template
-        self.prefix_combo = QComboBox()
-        templates = self.settings.DEFAULT_SETTINGS.get('default_prefix_template', 'simple')
-        self.prefix_combo.addItems(["simple", "with_quality", "with_date", "with_datetime", "with_resolution", "detailed", "full"])
-        layout.addRow("Default Filename Template:", self.prefix_combo)
-        
-        self.tab_widget.addTab(tab, "Encoding")
-    
-    def create_interface_tab(self):
-        """Create the interface settings tab"""
+        Args:
+            fields: Field rows of the tab
+            
+        Returns:
+            The tab widget
+        """
         tab = QWidget()
         layout = QFormLayout(tab)
         
-        # Show tooltips
-        self.tooltips_check = QCheckBox("Show tooltips")
-        layout.addRow("", self.tooltips_check)
-        
-        # Confirm overwrite
-        self.overwrite_check = QCheckBox("Confirm before overwriting files")
-        layout.addRow("", self.overwrite_check)
-        
-        # Remember last directory
-        self.remember_dir_check = QCheckBox("Remember last used directory")
-        layout.addRow("", self.remember_dir_check)
-        
-        # Recent files limit
-        self.recent_files_spin = QSpinBox()
-        self.recent_files_spin.setRange(0, 50)
-        layout.addRow("Maximum recent files:", self.recent_files_spin)
+        for field in fields:
+            kind = field.kind
+            if kind == 'combo_data':
+                # Values are taken from field.options by index, so the items carry no data
+                widget = QComboBox()
+                widget.addItems([text for _, text in field.options])
+                self.combo_indexes[field.key] = {data: i for i, (data, _) in enumerate(field.options)}
+            elif kind == 'combo_text':
+                widget = QComboBox()
+                widget.addItems(field.options)
+                self.combo_indexes[field.key] = {text: i for i, text in enumerate(field.options)}
+            elif kind == 'check':
+                widget = QCheckBox(field.options)
+            elif kind == 'spin':
+                widget = QSpinBox()
+                widget.setRange(*field.options)
+            else:
+                # Path edit with a browse button
+                widget = QLineEdit()
+                browse_button = QPushButton("Browse...")
+                if kind == 'dir':
+                    widget.setReadOnly(True)
+                    browse_button.clicked.connect(self.browse_output_dir)
+                else:
+                    browse_button.clicked.connect(self.browse_ffmpeg_path)
+                
+                path_layout = QHBoxLayout()
+                path_layout.addWidget(widget)
+                path_layout.addWidget(browse_button)
+                layout.addRow(field.label, path_layout)
+                self.widgets[field.key] = widget
+                continue
+            
+            layout.addRow(field.label, widget)
+            self.widgets[field.key] = widget
         
-        self.tab_widget.addTab(tab, "Interface")
+        return tab
     
-    def create_shortcuts_tab(self):
+    def create_shortcuts_tab(self) -> QWidget:
         """Create the keyboard shortcuts tab"""
         tab = QWidget()
         layout = QFormLayout(tab)
@@ -161,134 +201,154 @@ class SettingsDialog(QDialog):
         # Get default shortcuts
         shortcuts = self.settings.get('shortcuts', {})
         
-        # Create shortcut editors
-        for action, shortcut in shortcuts.items():
-            # Create a more readable action name
-            action_name = action.replace('_', ' ').title()
-            
+        # Create shortcut editors (filled in by load_tab)
+        for action in shortcuts:
             # Create shortcut editor
             shortcut_edit = QKeySequenceEdit()
-            shortcut_edit.setKeySequence(QKeySequence(shortcut))
+            shortcut_edit.setProperty('action', action)
+            shortcut_edit.editingFinished.connect(self.on_shortcut_edited)
             
             # Store reference to editor
             self.shortcut_edits[action] = shortcut_edit
             
             # Add to layout
-            layout.addRow(f"{action_name}:", shortcut_edit)
+            layout.addRow(_action_label(action), shortcut_edit)
         
-        self.tab_widget.addTab(tab, "Shortcuts")
+        return tab
     
-    def create_advanced_tab(self):
-        """Create the advanced settings tab"""
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        
-        # FFmpeg path
-        ffmpeg_layout = QHBoxLayout()
-        self.ffmpeg_path_edit = QLineEdit()
-        ffmpeg_layout.addWidget(self.ffmpeg_path_edit)
-        
-        self.ffmpeg_browse_button = QPushButton("Browse...")
-        self.ffmpeg_browse_button.clicked.connect(self.browse_ffmpeg_path)
-        ffmpeg_layout.addWidget(self.ffmpeg_browse_button)
-        
-        layout.addRow("FFmpeg Path:", ffmpeg_layout)
-        
-        # Enable logging
-        self.logging_check = QCheckBox("Enable logging")
-        layout.addRow("", self.logging_check)
-        
-        # Log level
-        self.log_level_combo = QComboBox()
-        self.log_level_combo.addItems(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
-        layout.addRow("Log Level:", self.log_level_combo)
+    @pyqtSlot()
+    def on_shortcut_edited(self):
+        """Remember which shortcut editor the user changed (shared by all editors)"""
+        self.edited_shortcuts.add(self.sender().property('action'))
+    
+    def ensure_tab(self, index: int):
+        """Create a tab's widgets and load its settings the first time it is shown
+        
+        Args:
+            index: Tab index
+        """
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        
+        fields = self.TABS[index][1]
+        tab = self.create_shortcuts_tab() if fields is None else self.create_form_tab(fields)
+        self.tab_widget.widget(index).layout().addWidget(tab)
+        self.load_tab(index)
+    
+    def refresh(self):
+        """Prepare a reused dialog for showing again
         
-        self.tab_widget.addTab(tab, "Advanced")
+        The dialog is kept by its parent between openings, so only the
+        backup and the values in the already created tabs need renewing.
+        """
+        self.backup_settings()
+        self.load_settings()
     
     def backup_settings(self):
-        """Backup original settings for cancel operation"""
-        self.original_settings = self.settings.settings.copy()
+        """Make the current settings the state Cancel returns to
+        
+        Only reset_settings changes the settings before Apply, so the
+        snapshot itself is taken there, the first time it is needed.
+        """
+        self.original_settings = None
     
     def load_settings(self):
-        """Load current settings into the UI"""
-        # General tab
-        language = self.settings.get('language', 'en')
-        index = self.language_combo.findData(language)
-        if index >= 0:
-            self.language_combo.setCurrentIndex(index)
-        
-        theme = self.settings.get('theme', 'system')
-        index = self.theme_combo.findData(theme)
-        if index >= 0:
-            self.theme_combo.setCurrentIndex(index)
-        
-        self.output_dir_edit.setText(self.settings.get_output_directory())
-        self.updates_check.setChecked(self.settings.get('check_updates', True))
-        
-        # Encoding tab
-        quality = self.settings.get('default_quality', 'medium')
-        index = self.quality_combo.findText(quality)
-        if index >= 0:
-            self.quality_combo.setCurrentIndex(index)
-        
-        format_str = self.settings.get('default_format', 'mp4')
-        index = self.format_combo.findText(format_str)
-        if index >= 0:
-            self.format_combo.setCurrentIndex(index)
-        
-        prefix = self.settings.get('default_prefix_template', 'simple')
-        index = self.prefix_combo.findText(prefix)
-        if index >= 0:
-            self.prefix_combo.setCurrentIndex(index)
-        
-        # Interface tab
-        self.tooltips_check.setChecked(self.settings.get('show_tooltips', True))
-        self.overwrite_check.setChecked(self.settings.get('confirm_overwrite', True))
-        self.remember_dir_check.setChecked(self.settings.get('remember_last_directory', True))
-        self.recent_files_spin.setValue(self.settings.get('max_recent_files', 10))
-        
-        # Advanced tab
-        self.ffmpeg_path_edit.setText(self.settings.get('ffmpeg_path', ''))
-        self.logging_check.setChecked(self.settings.get('enable_logging', True))
+        """Load current settings into the tabs created so far"""
+        for index in sorted(self.built_tabs):
+            self.load_tab(index)
+    
+    def load_tab(self, index: int):
+        """Load current settings into one tab
+        
+        Args:
+            index: Tab index
+        """
+        fields = self.TABS[index][1]
+        if fields is None:
+            shortcuts = self.settings.get('shortcuts', {})
+            for action, edit in self.shortcut_edits.items():
+                edit.setKeySequence(_key_sequence(shortcuts.get(action, '')))
+            self.edited_shortcuts.clear()
+            return
+        
+        for field in fields:
+            widget = self.widgets[field.key]
+            kind = field.kind
+            if field.key == 'output_directory':
+                value = self.settings.get_output_directory()
+                self.known_paths.add(value)  # get_output_directory makes sure it exists
+            else:
+                value = self.settings.get(field.key, field.default)
+            
+            # Loading is not an edit: keep change signals from reaching any slots
+            was_blocked = widget.blockSignals(True)
+            if kind == 'combo_data' or kind == 'combo_text':
+                item = self.combo_indexes[field.key].get(value)
+                if item is not None:
+                    widget.setCurrentIndex(item)
+            elif kind == 'check':
+                widget.setChecked(value)
+            elif kind == 'spin':
+                widget.setValue(value)
+            else:
+                widget.setText(value)
+            widget.blockSignals(was_blocked)
+    
+    def read_tab(self, index: int) -> Dict[str, Any]:
+        """Read the values shown in one tab
         
-        log_level = self.settings.get('log_level', 'INFO')
-        index = self.log_level_combo.findText(log_level)
-        if index >= 0:
-            self.log_level_combo.setCurrentIndex(index)
+        Args:
+            index: Tab index
+            
+        Returns:
+            Dictionary of setting keys and values
+        """
+        fields = self.TABS[index][1]
+        if fields is None:
+            # Only edited editors are read; the stored strings stand for the rest
+            if not self.edited_shortcuts:
+                return {}
+            current = self.settings.get('shortcuts', {})
+            shortcuts = dict(current)
+            for action in self.edited_shortcuts:
+                sequence = self.shortcut_edits[action].keySequence()
+                stored = current.get(action, '')
+                shortcuts[action] = stored if sequence == _key_sequence(stored) else sequence.toString()
+            return {'shortcuts': shortcuts}
+        
+        values = {}
+        for field in fields:
+            widget = self.widgets[field.key]
+            kind = field.kind
+            if kind == 'combo_data':
+                values[field.key] = field.options[widget.currentIndex()][0]
+            elif kind == 'combo_text':
+                values[field.key] = widget.currentText()
+            elif kind == 'check':
+                values[field.key] = widget.isChecked()
+            elif kind == 'spin':
+                values[field.key] = widget.value()
+            else:
+                values[field.key] = widget.text()
+        return values
     
     def apply_settings(self):
         """Apply the current settings"""
         try:
-            # General tab
-            self.settings.set('language', self.language_combo.currentData())
-            self.settings.set('theme', self.theme_combo.currentData())
-            self.settings.set('output_directory', self.output_dir_edit.text())
-            self.settings.set('check_updates', self.updates_check.isChecked())
-            
-            # Encoding tab
-            self.settings.set('default_quality', self.quality_combo.currentText())
-            self.settings.set('default_format', self.format_combo.currentText())
-            self.settings.set('default_prefix_template', self.prefix_combo.currentText())
-            
-            # Interface tab
-            self.settings.set('show_tooltips', self.tooltips_check.isChecked())
-            self.settings.set('confirm_overwrite', self.overwrite_check.isChecked())
-            self.settings.set('remember_last_directory', self.remember_dir_check.isChecked())
-            self.settings.set('max_recent_files', self.recent_files_spin.value())
-            
-            # Shortcuts tab
-            shortcuts = {}
-            for action, edit in self.shortcut_edits.items():
-                shortcuts[action] = edit.keySequence().toString()
-            self.settings.set('shortcuts', shortcuts)
+            # Only tabs that were opened can hold changes
+            values = {}
+            for index in self.built_tabs:
+                values.update(self.read_tab(index))
             
-            # Advanced tab
-            self.settings.set('ffmpeg_path', self.ffmpeg_path_edit.text())
-            self.settings.set('enable_logging', self.logging_check.isChecked())
-            self.settings.set('log_level', self.log_level_combo.currentText())
+            # Keep only real changes, so untouched values don't dirty the settings
+            updates = {key: value for key, value in values.items()
+                       if self.settings.get(key) != value}
             
-            # Save settings
-            self.settings.save_settings()
+            # Merge everything; the write is debounced so repeated Applies share one save
+            if updates:
+                self.settings.update(updates)
+            self.edited_shortcuts.clear()
             
             # Update backup
             self.backup_settings()
@@ -305,57 +365,82 @@ class SettingsDialog(QDialog):
     
     def reset_settings(self):
         """Reset settings to defaults"""
-        reply = QMessageBox.question(
-            self,
-            "Reset Settings",
-            "Are you sure you want to reset all settings to defaults?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
+        if self.reset_prompt is None:
+            self.reset_prompt = QMessageBox(
+                QMessageBox.Question,
+                "Reset Settings",
+                "Are you sure you want to reset all settings to defaults?",
+                QMessageBox.Yes | QMessageBox.No,
+                self
+            )
+            self.reset_prompt.setDefaultButton(QMessageBox.No)
         
-        if reply == QMessageBox.Yes:
+        if self.reset_prompt.exec_() == QMessageBox.Yes:
+            if self.original_settings is None:
+                self.original_settings = self.settings.snapshot()
             self.settings.reset()
             self.load_settings()
     
+    def get_browse_start(self, path: str, exists) -> str:
+        """Get the path a browse dialog should start at
+        
+        Args:
+            path: Path currently entered in the dialog
+            exists: os.path.isdir or os.path.isfile, used for paths not seen before
+            
+        Returns:
+            path if it exists, otherwise the home directory
+        """
+        if path and (path in self.known_paths or exists(path)):
+            self.known_paths.add(path)
+            return path
+        return _HOME
+    
     def browse_output_dir(self):
         """Browse for output directory"""
-        current_dir = self.output_dir_edit.text()
-        if not current_dir or not os.path.isdir(current_dir):
-            current_dir = os.path.expanduser('~')
-        
-        directory = QFileDialog.getExistingDirectory(
-            self,
-            "Select Output Directory",
-            current_dir,
-            QFileDialog.ShowDirsOnly
-        )
-        
-        if directory:
-            self.output_dir_edit.setText(directory)
+        current_dir = self.get_browse_start(self.widgets['output_directory'].text(), os.path.isdir)
+        
+        # Qt's own dialog, kept between clicks, instead of starting the native shell dialog each time
+        if self.output_dir_dialog is None:
+            self.output_dir_dialog = QFileDialog(self, _OUTPUT_DIR_TITLE)
+            self.output_dir_dialog.setFileMode(QFileDialog.Directory)
+            self.output_dir_dialog.setOptions(QFileDialog.ShowDirsOnly | QFileDialog.DontUseNativeDialog)
+        
+        self.output_dir_dialog.setDirectory(current_dir)
+        if self.output_dir_dialog.exec_():
+            directory = self.output_dir_dialog.selectedFiles()[0]
+            self.known_paths.add(directory)
+            self.widgets['output_directory'].setText(directory)
     
     def browse_ffmpeg_path(self):
         """Browse for FFmpeg executable"""
-        current_path = self.ffmpeg_path_edit.text()
-        if not current_path or not os.path.isfile(current_path):
-            current_path = os.path.expanduser('~')
-        
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select FFmpeg Executable",
-            current_path,
-            "Executables (*.exe);;All Files (*.*)"
-        )
-        
-        if file_path:
-            self.ffmpeg_path_edit.setText(file_path)
+        current_path = self.get_browse_start(self.widgets['ffmpeg_path'].text(), os.path.isfile)
+        
+        if self.ffmpeg_dialog is None:
+            self.ffmpeg_dialog = QFileDialog(self, _FFMPEG_TITLE)
+            self.ffmpeg_dialog.setFileMode(QFileDialog.ExistingFile)
+            self.ffmpeg_dialog.setNameFilter(_FFMPEG_FILTER)
+            self.ffmpeg_dialog.setOption(QFileDialog.DontUseNativeDialog)
+        
+        if current_path == _HOME:
+            self.ffmpeg_dialog.setDirectory(current_path)
+        else:
+            self.ffmpeg_dialog.selectFile(current_path)
+        if self.ffmpeg_dialog.exec_():
+            file_path = self.ffmpeg_dialog.selectedFiles()[0]
+            self.known_paths.add(file_path)
+            self.widgets['ffmpeg_path'].setText(file_path)
     
     def accept(self):
         """Handle dialog acceptance"""
         if self.apply_settings():
+            # One synchronous write on OK, covering any earlier Apply still pending
+            self.settings.flush()
             super().accept()
     
     def reject(self):
         """Handle dialog rejection"""
-        # Restore original settings
-        self.settings.settings = self.original_settings.copy()
+        # Restore original settings (only a reset can have changed them)
+        if self.original_settings is not None:
+            self.settings.restore(self.original_settings)
         super().reject()
\ No newline at end of file